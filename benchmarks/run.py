@@ -0,0 +1,185 @@
+from contextlib import contextmanager
+from datetime import datetime
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+
+from modules.certificate import Certificate, CertificateChain
+from modules.generator import HierarchyGenerator
+from modules.scenarios import Scenarios
+import modules.visualizer as visualizer
+
+# name -> (setup, ops); setup() returns the timed callable and ops is the
+# number of operations one call performs, for per-op throughput
+BENCHMARKS = {}
+
+def make_chains(length, count, seed=0):
+    if length == 1:
+        root = Certificate.create_root_ca()
+        return [chain_of(root) for _ in range(count)]
+    generator = HierarchyGenerator(seed=seed, fan_out=1, depth=length - 2, leaves=count)
+    return [chain for _, chain in generator.chains()]
+
+def chain_of(*certs):
+    chain = CertificateChain()
+    for cert in certs:
+        chain.add_certificate(cert)
+    return chain
+
+def register_validation(sizes, lengths):
+    for length in lengths:
+        for size in sizes:
+            for trust in (False, True):
+                name = f"validate/len={length}/n={size}/trust={str(trust).lower()}"
+
+                def setup(length=length, size=size, trust=trust):
+                    chains = make_chains(length, size)
+
+                    def run():
+                        for chain in chains:
+                            chain.validate(trust)
+                    return run
+                BENCHMARKS[name] = (setup, size)
+
+def register_construction(count):
+    def setup():
+        root = Certificate.create_root_ca()
+        intermediate = Certificate.create_intermediate(root)
+
+        def run():
+            for _ in range(count):
+                Certificate.create_leaf(intermediate)
+        return run
+    BENCHMARKS["construct/create_leaf"] = (setup, count)
+
+    def setup_hierarchy():
+        def run():
+            for _ in HierarchyGenerator(seed=1, fan_out=4, depth=2, leaves=count).chains():
+                pass
+        return run
+    BENCHMARKS["construct/generator"] = (setup_hierarchy, count)
+
+def register_scenarios(count):
+    builders = {
+        "basic": Scenarios.get_basic_chain,
+        "expired": Scenarios.get_expired_cert_chain,
+        "broken": Scenarios.get_broken_chain,
+        "untrusted": Scenarios.get_untrusted_chain,
+        "mitm": Scenarios.get_mitm_attack_chain,
+    }
+    for label, builder in builders.items():
+        def setup(builder=builder):
+            def run():
+                for _ in range(count):
+                    builder()
+            return run
+        BENCHMARKS[f"scenarios/{label}"] = (setup, count)
+
+@contextmanager
+def silent_console():
+    # draw_chain writes to the module console; render into memory instead
+    original = visualizer.console
+    visualizer.console = visualizer.Console(file=io.StringIO(), width=120, force_terminal=False)
+    try:
+        yield
+    finally:
+        visualizer.console = original
+
+def register_rendering(count, lengths):
+    for length in lengths:
+        def setup(length=length):
+            chain = make_chains(length, 1)[0]
+
+            def run():
+                with silent_console():
+                    for _ in range(count):
+                        visualizer.CertificateVisualizer.draw_chain(chain)
+            return run
+        BENCHMARKS[f"render/draw_chain/len={length}"] = (setup, count)
+
+def measure(setup, ops, repeat):
+    run = setup()
+    run()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {
+        "median_s": median,
+        "min_s": min(timings),
+        "ops": ops,
+        "ops_per_second": ops / median if median > 0 else 0.0,
+        "repeat": repeat,
+    }
+
+def compare(results, baseline, threshold):
+    # A benchmark regresses when its median is more than threshold slower
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = result["median_s"] / previous["median_s"] if previous["median_s"] > 0 else 1.0
+        result["baseline_median_s"] = previous["median_s"]
+        result["change"] = ratio - 1
+        if ratio - 1 > threshold:
+            regressions.append((name, ratio - 1))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark certificate validation, construction and rendering")
+    parser.add_argument("--output", help="Write results as JSON to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against a previously saved results file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline before failing (default: 0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="Smaller corpora for a fast smoke run")
+    args = parser.parse_args(argv)
+
+    sizes = [100, 1000] if args.quick else [1000, 10000]
+    lengths = [1, 3, 8]
+    count = 200 if args.quick else 2000
+    register_validation(sizes, lengths)
+    register_construction(count)
+    register_scenarios(count)
+    register_rendering(10 if args.quick else 100, lengths)
+
+    results = {}
+    for name, (setup, ops) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(setup, ops, args.repeat)
+        print(f"{name:<45} {results[name]['median_s'] * 1000:10.2f} ms "
+              f"{results[name]['ops_per_second']:14,.0f} ops/s", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as source:
+            regressions = compare(results, json.load(source)["benchmarks"], args.threshold)
+
+    report = {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+
+    for name, change in regressions:
+        print(f"REGRESSION {name}: {change:+.1%} (threshold {args.threshold:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,25 @@
-from rich.console import Console
-from rich.prompt import Prompt
-from rich.panel import Panel
 from modules.certificate import Certificate, CertificateChain
-from modules.visualizer import CertificateVisualizer
 from modules.scenarios import Scenarios
-from modules.quiz import QuizManager
+import json
 import sys
 import argparse
 
-console = Console()
+# rich, the visualizer, the quiz and the bulk pipeline are imported where they
+# are used, so --format json/plain starts without loading any of them.
+# The console is created in main() once the rich interface is actually needed.
+console = None
+
+# scenario -> (chain builder, trust_server_certificate, show MITM diagram)
+SCENARIOS = {
+    "1": (Scenarios.get_basic_chain, False, False),
+    "2": (Scenarios.get_expired_cert_chain, False, False),
+    "3": (Scenarios.get_broken_chain, False, False),
+    "4": (Scenarios.get_untrusted_chain, True, False),
+    "5": (Scenarios.get_mitm_attack_chain, True, True),
+}
 
 def show_welcome():
+    from rich.panel import Panel
     ascii_art = """[bold green]
      🔒 CERTIFICATE AUTHORITY LEARNING TOOL 🔒
 
@@ -36,6 +45,7 @@ def show_welcome():
     console.print(Panel(welcome_text, title="About", border_style="cyan"))
 
 def show_menu():
+    from rich.prompt import Prompt
     console.print("\n[bold cyan]Available Options:[/bold cyan]")
     console.print("1. Basic Valid Certificate Chain")
     console.print("2. Expired Certificate Scenario")
@@ -48,6 +58,7 @@ def show_menu():
     return Prompt.ask("\nSelect an option", choices=["1", "2", "3", "4", "5", "6", "7"])
 
 def explain_scenario(scenario_num):
+    from rich.panel import Panel
     explanations = {
         "1": """
         [bold]Basic Valid Certificate Chain[/bold]
@@ -103,6 +114,7 @@ def explain_scenario(scenario_num):
     console.print(Panel(explanations[scenario_num], border_style="blue"))
 
 def run_scenario(scenario_num, non_interactive=False):
+    from modules.visualizer import CertificateVisualizer
     try:
         if not non_interactive:
             explain_scenario(scenario_num)
@@ -111,19 +123,9 @@ def run_scenario(scenario_num, non_interactive=False):
         trust_server_certificate = False
         show_mitm = False
 
-        if scenario_num == "1":
-            chain = Scenarios.get_basic_chain()
-        elif scenario_num == "2":
-            chain = Scenarios.get_expired_cert_chain()
-        elif scenario_num == "3":
-            chain = Scenarios.get_broken_chain()
-        elif scenario_num == "4":
-            chain = Scenarios.get_untrusted_chain()
-            trust_server_certificate = True
-        elif scenario_num == "5":
-            chain = Scenarios.get_mitm_attack_chain()
-            trust_server_certificate = True
-            show_mitm = True
+        if scenario_num in SCENARIOS:
+            builder, trust_server_certificate, show_mitm = SCENARIOS[scenario_num]
+            chain = builder()
 
         if chain is None:
             console.print("[red]Error: Failed to create certificate chain[/red]")
@@ -154,19 +156,134 @@ def run_scenario(scenario_num, non_interactive=False):
             console.print("\n[bold]Press Enter to continue...[/bold]")
             input()
 
+def run_machine_readable(args):
+    # Structured results for scripts and health checks: no rich, no prompts.
+    # Exits non-zero when any reported chain fails validation.
+    results = []
+    for scenario_num in ([args.scenario] if args.scenario else sorted(SCENARIOS)):
+        builder, trust_server_certificate, _ = SCENARIOS[scenario_num]
+        chain = builder()
+        result, message = chain.validate(trust_server_certificate)
+        results.append({
+            "scenario": scenario_num,
+            "valid": result,
+            "message": message,
+            "trust_server_certificate": trust_server_certificate,
+            "chain": [cert.to_dict() for cert in chain.certificates],
+        })
+
+    if args.format == "json":
+        print(json.dumps(results if not args.scenario else results[0], indent=2))
+    else:
+        for entry in results:
+            status = "PASS" if entry["valid"] else "FAIL"
+            print(f"{entry['scenario']}\t{status}\t{entry['message']}")
+    return 0 if all(entry["valid"] for entry in results) else 1
+
+def write_stats(args):
+    from modules import metrics
+    collected = metrics.disable()
+    if collected is None:
+        return
+    if args.stats == "-":
+        # stdout may carry JSON results, so the metrics go to stderr
+        sys.stderr.write(collected.render_prometheus())
+    else:
+        collected.write_prometheus(args.stats)
+
+def run_bulk_validation(args):
+    from rich.console import Console
+    from modules.bulk import validate_file, DEFAULT_CHUNK_SIZE
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = validate_file(args.validate_file, output, workers=args.workers,
+                              chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+                              revocation_path=args.revocation_list, pins_path=args.pins,
+                              pin_log_path=args.pin_log)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    # Results may be on stdout, so the summary goes to stderr
+    summary = Console(stderr=True)
+    summary.print(f"\n[bold cyan]Validated {stats['chains']} chains[/bold cyan] "
+                  f"([green]{stats['valid']} valid[/green], [red]{stats['invalid']} invalid[/red])")
+    if stats['pin_violations']:
+        summary.print(f"[yellow]{stats['pin_violations']} pin violations logged to {args.pin_log}[/yellow]")
+    if stats['skipped_rows']:
+        summary.print(f"[yellow]Skipped {stats['skipped_rows']} malformed rows[/yellow]")
+    summary.print(f"Elapsed: {stats['seconds']:.2f}s, throughput: {stats['chains_per_second']:,.0f} chains/sec")
+
 def main():
     parser = argparse.ArgumentParser(description='CA Certificate Learning Tool')
     parser.add_argument('--scenario', type=str, choices=['1', '2', '3', '4', '5'],
                        help='Run a specific scenario non-interactively')
     parser.add_argument('--quiz', action='store_true',
                        help='Start the PKI knowledge quiz directly')
+    parser.add_argument('--validate-file', type=str, metavar='PATH',
+                       help='Validate every chain in a JSONL or CSV file in parallel')
+    parser.add_argument('--output', type=str, metavar='PATH',
+                       help='Write --validate-file results here instead of stdout')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for --validate-file (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help='Chains sent to a worker at a time for --validate-file (default: 2000)')
+    parser.add_argument('--revocation-list', type=str, metavar='PATH',
+                       help='File of revoked serial numbers (one per line) for --validate-file')
+    parser.add_argument('--pins', type=str, metavar='PATH',
+                       help='JSON pin file (hostname -> allowed CA serials) for --validate-file')
+    parser.add_argument('--pin-log', type=str, metavar='PATH',
+                       help='Append --pins violations to PATH as JSON lines (see modules.pinning)')
+    parser.add_argument('--format', choices=['rich', 'json', 'plain'], default='rich',
+                       help='Output format for scenario results; json/plain skip the rich interface '
+                            '(all scenarios when --scenario is not given)')
+    parser.add_argument('--json', dest='format', action='store_const', const='json',
+                       help='Shorthand for --format json')
+    parser.add_argument('--stats', nargs='?', const='-', metavar='PATH',
+                       help='Record validation metrics and write them in Prometheus text format '
+                            'to PATH (default: stderr)')
+    parser.add_argument('--profile', nargs='?', const='profile', metavar='PREFIX',
+                       help='Profile the run (CPU and allocations) and write PREFIX.hotspots.txt, '
+                            'PREFIX.collapsed.txt and PREFIX.allocations.txt (default prefix: profile)')
     args = parser.parse_args()
+    if args.pin_log and not args.pins:
+        parser.error("--pin-log requires --pins")
+
+    if not args.profile:
+        run(args)
+        return
+
+    from modules.profiling import Profiler
+    if args.validate_file and args.workers is None:
+        # Worker processes aren't profiled, so validate in this process
+        args.workers = 1
+    with Profiler(args.profile):
+        run(args)
+
+def run(args):
+    if args.stats:
+        from modules import metrics
+        metrics.enable()
+
+    if args.format != 'rich' and not args.validate_file and not args.quiz:
+        status = run_machine_readable(args)
+        write_stats(args)
+        sys.exit(status)
+
+    global console
+    from rich.console import Console
+    console = Console()
 
     try:
-        if args.scenario:
+        if args.validate_file:
+            run_bulk_validation(args)
+            return
+        elif args.scenario:
             run_scenario(args.scenario, non_interactive=True)
             return
         elif args.quiz:
+            from modules.quiz import QuizManager
             quiz = QuizManager()
             quiz.run_quiz(non_interactive=True) 
             return
@@ -178,6 +295,7 @@ def main():
                 console.print("\n[bold green]Thank you for using the CA Certificate Learning Tool![/bold green]")
                 break
             elif choice == "6":
+                from modules.quiz import QuizManager
                 quiz = QuizManager()
                 quiz.run_quiz(non_interactive=False)
             else:
@@ -188,6 +306,8 @@ def main():
     except Exception as e:
         console.print(f"\n[red]Fatal error: {str(e)}[/red]")
         sys.exit(1)
+    finally:
+        write_stats(args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,158 @@
+from datetime import datetime
+import numpy as np
+from .certificate import to_epoch
+
+# Status codes returned by BatchValidator.validate
+VALID = 0
+EMPTY_CHAIN = 1
+NOT_YET_VALID = 2
+EXPIRED = 3
+TRUST_BYPASS = 4
+INVALID_ISSUER = 5
+NOT_ROOT = 6
+REVOKED = 7
+PIN_VIOLATION = 8
+
+VALID_CODES = (VALID, TRUST_BYPASS)
+
+class PackedChains:
+    def __init__(self, chains):
+        self.chains = list(chains)
+        self.names = []
+        name_ids = {}
+
+        def intern(name):
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = name_ids[name] = len(self.names)
+                self.names.append(name)
+            return name_id
+
+        lengths = []
+        valid_from, valid_to, subjects, issuers, roots = [], [], [], [], []
+        self.serials = []
+        for chain in self.chains:
+            lengths.append(len(chain.certificates))
+            for cert in chain.certificates:
+                self.serials.append(cert.serial_number)
+                valid_from.append(to_epoch(cert.valid_from))
+                valid_to.append(to_epoch(cert.valid_to))
+                subjects.append(intern(cert.subject))
+                issuers.append(intern(cert.issuer))
+                roots.append(cert.is_root)
+
+        self.lengths = np.array(lengths, dtype=np.int64)
+        self.offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(self.lengths, out=self.offsets[1:])
+        self.valid_from = np.array(valid_from, dtype=np.int64)
+        self.valid_to = np.array(valid_to, dtype=np.int64)
+        self.subject_ids = np.array(subjects, dtype=np.int64)
+        self.issuer_ids = np.array(issuers, dtype=np.int64)
+        self.is_root = np.array(roots, dtype=bool)
+
+    def __len__(self):
+        return len(self.chains)
+
+class BatchValidator:
+    @staticmethod
+    def pack(chains):
+        return PackedChains(chains)
+
+    @staticmethod
+    def validate(chains, trust_server_certificate=False, now=None, revocation=None, pins=None):
+        packed = chains if isinstance(chains, PackedChains) else PackedChains(chains)
+        codes, positions = BatchValidator.validate_codes(packed, trust_server_certificate, now, revocation, pins)
+        messages = [BatchValidator.message(packed, i, code, pos)
+                    for i, (code, pos) in enumerate(zip(codes.tolist(), positions.tolist()))]
+        return codes, messages
+
+    @staticmethod
+    def validate_codes(packed, trust_server_certificate=False, now=None, revocation=None, pins=None):
+        observed_at = now or datetime.now()
+        now = to_epoch(observed_at)
+        n_chains = len(packed)
+        n_certs = len(packed.valid_from)
+        starts = packed.offsets[:-1]
+        ends = packed.offsets[1:]
+        nonempty = packed.lengths > 0
+
+        codes = np.full(n_chains, EMPTY_CHAIN, dtype=np.int8)
+        # Flat index of the certificate each failure refers to
+        positions = np.full(n_chains, -1, dtype=np.int64)
+        if n_certs == 0:
+            return codes, positions
+
+        index = np.arange(n_certs, dtype=np.int64)
+
+        # Dates and revocation: the first certificate in the chain that fails a check
+        not_yet = now < packed.valid_from
+        expired = now > packed.valid_to
+        failed = not_yet | expired
+        if revocation is not None:
+            revoked = np.asarray(revocation.revoked_mask(packed.serials), dtype=bool)
+            failed |= revoked
+        first_date = BatchValidator._first(failed, index, starts, nonempty, n_certs)
+        date_failed = first_date < n_certs
+        safe_first = np.minimum(first_date, n_certs - 1)
+
+        # Linkage: certificate i must be issued by the subject of certificate i + 1
+        mismatch = np.zeros(n_certs, dtype=bool)
+        mismatch[:-1] = packed.issuer_ids[:-1] != packed.subject_ids[1:]
+        mismatch[ends[nonempty] - 1] = False
+        first_link = BatchValidator._first(mismatch, index, starts, nonempty, n_certs)
+        link_failed = first_link < n_certs
+
+        last_is_root = np.zeros(n_chains, dtype=bool)
+        last_is_root[nonempty] = packed.is_root[ends[nonempty] - 1]
+
+        codes[nonempty] = VALID
+        if not trust_server_certificate:
+            codes[nonempty & ~last_is_root] = NOT_ROOT
+            codes[link_failed] = INVALID_ISSUER
+            positions[link_failed] = first_link[link_failed]
+        else:
+            codes[nonempty] = TRUST_BYPASS
+
+        if pins is not None:
+            # Pins are a hash lookup per chain; only chains that pass the date
+            # checks are looked at, matching the order in CertificateChain.validate
+            for i in np.flatnonzero(nonempty & ~date_failed).tolist():
+                if pins.check(packed.chains[i], observed_at):
+                    codes[i] = PIN_VIOLATION
+                    positions[i] = starts[i]
+
+        date_codes = np.where(not_yet[safe_first], NOT_YET_VALID,
+                              np.where(expired[safe_first], EXPIRED, REVOKED)).astype(np.int8)
+        codes[date_failed] = date_codes[date_failed]
+        positions[date_failed] = first_date[date_failed]
+        return codes, positions
+
+    @staticmethod
+    def _first(mask, index, starts, nonempty, missing):
+        first = np.full(len(starts), missing, dtype=np.int64)
+        if nonempty.any():
+            candidates = np.where(mask, index, missing)
+            first[nonempty] = np.minimum.reduceat(candidates, starts[nonempty])
+        return first
+
+    @staticmethod
+    def message(packed, chain_index, code, position):
+        names = packed.names
+        if code == VALID:
+            return "Valid certificate chain"
+        if code == TRUST_BYPASS:
+            return "Valid (Trust Server Certificate enabled - chain validation skipped)"
+        if code == EMPTY_CHAIN:
+            return "Empty chain"
+        if code == NOT_YET_VALID:
+            return f"Certificate for {names[packed.subject_ids[position]]} is not yet valid"
+        if code == EXPIRED:
+            return f"Certificate for {names[packed.subject_ids[position]]} has expired"
+        if code == REVOKED:
+            return f"Certificate for {names[packed.subject_ids[position]]} has been revoked"
+        if code == PIN_VIOLATION:
+            return f"Pin violation: {names[packed.subject_ids[position]]} is not issued by a pinned CA"
+        if code == INVALID_ISSUER:
+            return (f"Invalid issuer: {names[packed.subject_ids[position]]} "
+                    f"not issued by {names[packed.subject_ids[position + 1]]}")
+        return "Chain doesn't end with a trusted root certificate"
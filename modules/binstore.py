@@ -0,0 +1,209 @@
+import mmap
+import struct
+import uuid
+from .certificate import Certificate, to_epoch, from_epoch
+from .compact import pack_serial
+from .truststore import build_chain
+
+# File layout (little endian):
+#   header   magic, version, record size, record count, name count, name table offset
+#   records  fixed-width, sorted by subject id
+#   names    (name count + 1) u64 offsets followed by the UTF-8 blob, sorted by bytes
+# Names are sorted so subject lookups are a binary search over the mapped file,
+# and records are sorted by subject id so a subject's certificates are contiguous.
+MAGIC = b"CERTSTR1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQ")
+# subject id, issuer id, valid_from us, valid_to us, serial, flags
+RECORD = struct.Struct("<IIqq16sB3x")
+OFFSET = struct.Struct("<Q")
+NAME_ID = struct.Struct("<I")
+
+FLAG_ROOT = 1
+FLAG_SERIAL_NAME = 2
+
+def write_store(path, certificates):
+    rows = []
+    names = set()
+    for cert in certificates:
+        serial = pack_serial(cert.serial_number)
+        names.add(cert.subject)
+        names.add(cert.issuer)
+        if isinstance(serial, str):
+            names.add(serial)
+        rows.append((cert.subject, cert.issuer, to_epoch(cert.valid_from),
+                     to_epoch(cert.valid_to), serial, cert.is_root))
+
+    encoded = sorted(name.encode("utf-8") for name in names)
+    name_ids = {name.decode("utf-8"): i for i, name in enumerate(encoded)}
+    rows.sort(key=lambda row: name_ids[row[0]])
+
+    with open(path, "wb") as output:
+        names_offset = HEADER.size + RECORD.size * len(rows)
+        output.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(rows), len(encoded), names_offset))
+
+        for subject, issuer, valid_from, valid_to, serial, is_root in rows:
+            flags = FLAG_ROOT if is_root else 0
+            if isinstance(serial, str):
+                flags |= FLAG_SERIAL_NAME
+                serial_bytes = NAME_ID.pack(name_ids[serial]).ljust(16, b"\0")
+            else:
+                serial_bytes = serial.to_bytes(16, "little")
+            output.write(RECORD.pack(name_ids[subject], name_ids[issuer], valid_from,
+                                     valid_to, serial_bytes, flags))
+
+        position = 0
+        for name in encoded:
+            output.write(OFFSET.pack(position))
+            position += len(name)
+        output.write(OFFSET.pack(position))
+        for name in encoded:
+            output.write(name)
+    return len(rows)
+
+class CertificateRecord:
+    # Lazy view over one record: fields are decoded from the mapping on access
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def _fields(self):
+        return RECORD.unpack_from(self.store.mapping, self.store.record_offset(self.index))
+
+    @property
+    def subject(self):
+        return self.store.name(self._fields()[0])
+
+    @property
+    def issuer(self):
+        return self.store.name(self._fields()[1])
+
+    @property
+    def valid_from(self):
+        return from_epoch(self._fields()[2])
+
+    @property
+    def valid_to(self):
+        return from_epoch(self._fields()[3])
+
+    @property
+    def is_root(self):
+        return bool(self._fields()[5] & FLAG_ROOT)
+
+    @property
+    def serial_number(self):
+        fields = self._fields()
+        return self.store.decode_serial(fields[4], fields[5])
+
+    def materialize(self):
+        return self.store[self.index]
+
+class MappedCertificateStore:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.count, self.name_count, self.names_offset = \
+            HEADER.unpack_from(self.mapping, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} certificate store")
+        self.blob_offset = self.names_offset + OFFSET.size * (self.name_count + 1)
+        self.names = {}
+        self.materialized = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.mapping.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def record_offset(self, index):
+        return HEADER.size + RECORD.size * index
+
+    def record(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return CertificateRecord(self, index)
+
+    def __getitem__(self, index):
+        cert = self.materialized.get(index)
+        if cert is None:
+            if not 0 <= index < self.count:
+                raise IndexError(index)
+            subject_id, issuer_id, valid_from, valid_to, serial, flags = \
+                RECORD.unpack_from(self.mapping, self.record_offset(index))
+            cert = Certificate(
+                subject=self.name(subject_id),
+                issuer=self.name(issuer_id),
+                valid_from=from_epoch(valid_from),
+                valid_to=from_epoch(valid_to),
+                is_root=bool(flags & FLAG_ROOT),
+                serial_number=self.decode_serial(serial, flags)
+            )
+            self.materialized[index] = cert
+        return cert
+
+    def _name_bytes(self, name_id):
+        start, end = struct.unpack_from("<QQ", self.mapping, self.names_offset + OFFSET.size * name_id)
+        return self.mapping[self.blob_offset + start:self.blob_offset + end]
+
+    def name(self, name_id):
+        name = self.names.get(name_id)
+        if name is None:
+            name = self.names[name_id] = self._name_bytes(name_id).decode("utf-8")
+        return name
+
+    def name_id(self, name):
+        target = name.encode("utf-8")
+        low, high = 0, self.name_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._name_bytes(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.name_count and self._name_bytes(low) == target:
+            return low
+        return None
+
+    def decode_serial(self, serial, flags):
+        if flags & FLAG_SERIAL_NAME:
+            return self.name(NAME_ID.unpack_from(serial)[0])
+        return str(uuid.UUID(int=int.from_bytes(serial, "little")))
+
+    def _subject_id(self, index):
+        return NAME_ID.unpack_from(self.mapping, self.record_offset(index))[0]
+
+    def subject_range(self, subject):
+        subject_id = self.name_id(subject)
+        if subject_id is None:
+            return range(0)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._subject_id(mid) < subject_id:
+                low = mid + 1
+            else:
+                high = mid
+        end = low
+        while end < self.count and self._subject_id(end) == subject_id:
+            end += 1
+        return range(low, end)
+
+    def find_by_subject(self, subject):
+        return [self[index] for index in self.subject_range(subject)]
+
+    def find_issuers(self, cert):
+        return self.find_by_subject(cert.issuer)
+
+    def build_chain(self, leaf, pool=(), max_length=16):
+        return build_chain(leaf, self.find_issuers, pool, max_length)
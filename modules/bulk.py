@@ -0,0 +1,171 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+import json
+import os
+import time
+from .ingest import CertificateReader, detect_format, open_source, parse_chain_record
+from .pinning import PinStore, PinViolationLog
+from .revocation import RevocationList
+from . import metrics
+
+# Each line of a chain file is one JSON record:
+# {"certificates": [<leaf>, ..., <root>], "trust_server_certificate": false}
+# where every certificate uses the keys of Certificate.to_dict(). CSV files in
+# the row-per-certificate layout of modules.ingest are grouped in the parent.
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Revocation list and pins of the current process; each worker loads its own
+# copies once
+_revocation = None
+_pins = None
+
+def load_revocation(path):
+    global _revocation
+    _revocation = RevocationList.load(path) if path else None
+
+def load_pins(path, log=None):
+    global _pins
+    _pins = PinStore.load(path, log) if path else None
+
+def init_worker(revocation_path, collect_metrics, pins_path=None, collect_violations=False):
+    # Workers log pin violations in memory and hand them to the parent with
+    # each chunk's results, so a run has one violation log
+    load_revocation(revocation_path)
+    load_pins(pins_path, PinViolationLog() if collect_violations else None)
+    if collect_metrics:
+        metrics.enable()
+
+def parse_chain(line):
+    return parse_chain_record(json.loads(line))
+
+def validate_line(line, trust_server_certificate=None):
+    if isinstance(line, tuple):
+        chain, trust_flag = line
+        if chain is None:
+            # Skipped by the CSV reader, which reports why
+            return False, "Malformed chain"
+    else:
+        try:
+            chain, trust_flag = parse_chain(line)
+        except (ValueError, KeyError, TypeError) as e:
+            return False, f"Malformed record: {e}"
+    if trust_server_certificate is not None:
+        trust_flag = trust_server_certificate
+    return chain.validate(trust_flag, _revocation, pins=_pins)
+
+def validate_chunk(chunk, trust_server_certificate=None):
+    # Workers receive raw lines: strings pickle far cheaper than Certificate objects
+    return [validate_line(line, trust_server_certificate) for line in chunk]
+
+def validate_chunk_collecting(chunk, trust_server_certificate=None):
+    # Hands the worker's metrics and pin violations for this chunk back to
+    # the parent to merge; either is None when not being collected
+    results = validate_chunk(chunk, trust_server_certificate)
+    chunk_metrics = None
+    if metrics.current() is not None:
+        chunk_metrics = metrics.disable()
+        metrics.enable()
+    violations = None
+    if _pins is not None and _pins.log is not None:
+        violations = _pins.log.entries
+        _pins.log = PinViolationLog()
+    return results, chunk_metrics, violations
+
+def read_chunks(lines, chunk_size):
+    lines = (line for line in lines if not isinstance(line, str) or line.strip())
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def validate_chunks(chunks, workers=None, trust_server_certificate=None, revocation_path=None, pins_path=None,
+                    pin_log=None):
+    # pin_log, a PinViolationLog, receives the violations found by every worker
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        load_revocation(revocation_path)
+        load_pins(pins_path, pin_log)
+        for chunk in chunks:
+            yield validate_chunk(chunk, trust_server_certificate)
+        return
+
+    collected = metrics.current()
+    collect_violations = pin_log is not None and pins_path is not None
+    task = validate_chunk_collecting if collected is not None or collect_violations else validate_chunk
+
+    def result(future):
+        if task is validate_chunk:
+            return future.result()
+        results, worker_metrics, violations = future.result()
+        if worker_metrics is not None:
+            collected.merge(worker_metrics)
+        for violation in violations or ():
+            pin_log.record(violation)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(revocation_path, collected is not None, pins_path,
+                                       collect_violations)) as executor:
+        # Keep a bounded window of chunks in flight so large files don't get
+        # read into memory ahead of the workers; results come back in input order
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(task, chunk, trust_server_certificate))
+            if len(pending) >= workers * 2:
+                yield result(pending.popleft())
+        while pending:
+            yield result(pending.popleft())
+
+def validate_file(path, output, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, trust_server_certificate=None,
+                  revocation_path=None, pins_path=None, pin_log_path=None):
+    # With pin_log_path, pin violations are appended there as JSON lines
+    # (see PinViolationLog) for querying after the run
+    started = time.perf_counter()
+    total = 0
+    valid = 0
+    reader = None
+    # CSV chain ids in input order, matched up with results as they come back
+    chain_ids = deque()
+
+    def csv_items():
+        for chain_id, chain, flag in reader.chains(include_skipped=True):
+            chain_ids.append(chain_id)
+            yield chain, flag
+
+    if detect_format(path) == "csv":
+        reader = CertificateReader(path, format="csv")
+        source = None
+        items = csv_items()
+    else:
+        source = open_source(path)
+        items = source
+    pin_log = PinViolationLog(pin_log_path) if pin_log_path else None
+
+    try:
+        for results in validate_chunks(read_chunks(items, chunk_size), workers, trust_server_certificate,
+                                       revocation_path, pins_path, pin_log):
+            for result, message in results:
+                record = {"index": total, "valid": result, "message": message}
+                if reader is not None:
+                    record["chain_id"] = chain_ids.popleft()
+                output.write(json.dumps(record) + "\n")
+                total += 1
+                valid += result
+    finally:
+        if source is not None:
+            source.close()
+        if pin_log is not None:
+            pin_log.close()
+    elapsed = time.perf_counter() - started
+    return {
+        "chains": total,
+        "valid": valid,
+        "invalid": total - valid,
+        "skipped_rows": reader.error_count if reader else 0,
+        "pin_violations": len(pin_log) if pin_log is not None else 0,
+        "seconds": elapsed,
+        "chains_per_second": total / elapsed if elapsed > 0 else 0.0,
+    }
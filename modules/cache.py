@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+RESOLUTION = timedelta(microseconds=1)
+
+def chain_fingerprint(chain, trust_server_certificate=False):
+    return (tuple(cert.serial_number for cert in chain.certificates), bool(trust_server_certificate))
+
+def validity_window(chain, now):
+    # validate() only depends on the clock through the certificate dates, so its
+    # result is fixed between the closest date boundaries around `now`
+    start = None
+    end = None
+    for cert in chain.certificates:
+        # A certificate becomes valid at valid_from and expires just after valid_to
+        for boundary in (cert.valid_from, cert.valid_to + RESOLUTION):
+            if boundary <= now:
+                if start is None or boundary > start:
+                    start = boundary
+            elif end is None or boundary < end:
+                end = boundary
+    return start, end
+
+class ValidationCache:
+    def __init__(self, max_size=10000):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def validate(self, chain, trust_server_certificate=False):
+        key = chain_fingerprint(chain, trust_server_certificate)
+        now = datetime.now()
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            result, message, start, end = entry
+            if (start is None or start <= now) and (end is None or now < end):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result, message
+            del self.entries[key]
+            self.expirations += 1
+
+        self.misses += 1
+        result, message = chain.validate(trust_server_certificate, at=now)
+        start, end = validity_window(chain, now)
+        self._store(key, (result, message, start, end))
+        return result, message
+
+    def _store(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, chain):
+        removed = 0
+        for trust_server_certificate in (False, True):
+            if self.entries.pop(chain_fingerprint(chain, trust_server_certificate), None) is not None:
+                removed += 1
+        return removed
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
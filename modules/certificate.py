@@ -2,6 +2,25 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import uuid
 
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+def to_epoch(dt):
+    # Exact integer microseconds, so comparisons match datetime comparisons
+    return (dt - EPOCH) // MICROSECOND
+
+def from_epoch(value):
+    return EPOCH + timedelta(microseconds=value)
+
+EMPTY_MESSAGE = "Empty chain"
+TRUST_BYPASS_MESSAGE = "Valid (Trust Server Certificate enabled - chain validation skipped)"
+VALID_MESSAGE = "Valid certificate chain"
+NOT_ROOT_MESSAGE = "Chain doesn't end with a trusted root certificate"
+PASSING_OUTCOMES = frozenset(("valid", "trust_bypass"))
+
+# Set by modules.metrics.enable(); while None, validate() pays one global lookup
+instrumentation = None
+
 @dataclass
 class Certificate:
     subject: str
@@ -47,6 +66,27 @@ class Certificate:
             serial_number=str(uuid.uuid4())
         )
 
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            subject=data["subject"],
+            issuer=data["issuer"],
+            valid_from=datetime.fromisoformat(data["valid_from"]),
+            valid_to=datetime.fromisoformat(data["valid_to"]),
+            is_root=bool(data.get("is_root", False)),
+            serial_number=str(data["serial_number"])
+        )
+
+    def to_dict(self):
+        return {
+            "subject": self.subject,
+            "issuer": self.issuer,
+            "valid_from": self.valid_from.isoformat(),
+            "valid_to": self.valid_to.isoformat(),
+            "is_root": self.is_root,
+            "serial_number": self.serial_number
+        }
+
 class CertificateChain:
     def __init__(self):
         self.certificates = []
@@ -54,18 +94,85 @@ class CertificateChain:
     def add_certificate(self, cert):
         self.certificates.append(cert)
 
-    def validate(self, trust_server_certificate=False):
+    # Validation stages, shared with the timed path in modules.metrics. Each
+    # returns None when the chain passes, else (outcome, message)
+    def check_dates(self, now, revocation=None):
+        for cert in self.certificates:
+            if now < cert.valid_from:
+                return "not_yet_valid", f"Certificate for {cert.subject} is not yet valid"
+            if now > cert.valid_to:
+                return "expired", f"Certificate for {cert.subject} has expired"
+            if revocation is not None and revocation.is_revoked(cert.serial_number):
+                return "revoked", f"Certificate for {cert.subject} has been revoked"
+        return None
+
+    def check_pins(self, pins, now):
+        violation = pins.check(self, now)
+        return ("pin_violation", violation) if violation else None
+
+    def check_linkage(self):
+        certs = self.certificates
+        for i in range(len(certs) - 1):
+            if certs[i].issuer != certs[i + 1].subject:
+                return "invalid_issuer", f"Invalid issuer: {certs[i].subject} not issued by {certs[i + 1].subject}"
+        return None
+
+    def check_root(self):
+        return None if self.certificates[-1].is_root else ("non_root", NOT_ROOT_MESSAGE)
+
+    def evaluate(self, now, trust_server_certificate=False, revocation=None, pins=None, stage=None):
+        # (outcome, message) for a non-empty chain. `stage`, when given, is
+        # called as stage(name, check, *args) to run each stage, e.g. to time it
+        run = stage or _run_stage
+
+        # Check certificate dates (and revocation, when a list is given) first
+        failure = run("dates", self.check_dates, now, revocation)
+        if failure:
+            return failure
+
+        # Pins are checked before the trust bypass, so a pinned host served
+        # by the wrong CA is caught even when chain validation is skipped
+        if pins is not None:
+            failure = run("pins", self.check_pins, pins, now)
+            if failure:
+                return failure
+
+        # If trustServerCertificate is True, we only validate dates, not the chain
+        if trust_server_certificate:
+            return "trust_bypass", TRUST_BYPASS_MESSAGE
+
+        # Validate the certificate chain, then that it ends with a root CA
+        return (run("linkage", self.check_linkage) or run("root", self.check_root)
+                or ("valid", VALID_MESSAGE))
+
+    def validate(self, trust_server_certificate=False, revocation=None, at=None, pins=None):
+        if instrumentation is not None:
+            return instrumentation.validate(self, trust_server_certificate, revocation, at, pins)
+
         if not self.certificates:
             return False, "Empty chain"
 
-        now = datetime.now()
+        # Validate as of `at` when given, e.g. to ask whether the chain is valid next month
+        now = at or datetime.now()
 
-        # Check certificate dates first
+        # The same stages as evaluate(), inlined: this is the hot path, and
+        # method calls per stage cost about a quarter more per chain
+
+        # Check certificate dates (and revocation, when a list is given) first
         for cert in self.certificates:
             if now < cert.valid_from:
                 return False, f"Certificate for {cert.subject} is not yet valid"
             if now > cert.valid_to:
                 return False, f"Certificate for {cert.subject} has expired"
+            if revocation is not None and revocation.is_revoked(cert.serial_number):
+                return False, f"Certificate for {cert.subject} has been revoked"
+
+        # Pins are checked before the trust bypass, so a pinned host served
+        # by the wrong CA is caught even when chain validation is skipped
+        if pins is not None:
+            violation = pins.check(self, now)
+            if violation:
+                return False, violation
 
         # If trustServerCertificate is True, we only validate dates, not the chain
         if trust_server_certificate:
@@ -84,4 +191,7 @@ class CertificateChain:
             return False, "Chain doesn't end with a trusted root certificate"
 
         # If we got here, the chain is valid
-        return True, "Valid certificate chain"
\ No newline at end of file
+        return True, "Valid certificate chain"
+
+def _run_stage(name, check, *args):
+    return check(*args)
\ No newline at end of file
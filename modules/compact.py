@@ -0,0 +1,104 @@
+import sys
+import uuid
+import tracemalloc
+from .certificate import Certificate, to_epoch, from_epoch
+
+class CompactCertificate:
+    # Timestamps are epoch microseconds; the serial is a 128-bit int when it is
+    # a UUID and the original (interned) string otherwise
+    __slots__ = ("subject", "issuer", "valid_from_us", "valid_to_us", "is_root", "serial")
+
+    def __init__(self, subject, issuer, valid_from_us, valid_to_us, is_root, serial):
+        self.subject = sys.intern(subject)
+        self.issuer = sys.intern(issuer)
+        self.valid_from_us = valid_from_us
+        self.valid_to_us = valid_to_us
+        self.is_root = is_root
+        self.serial = serial
+
+    def __repr__(self):
+        return (f"CompactCertificate(subject={self.subject!r}, issuer={self.issuer!r}, "
+                f"valid_from={self.valid_from!r}, valid_to={self.valid_to!r}, "
+                f"is_root={self.is_root!r}, serial_number={self.serial_number!r})")
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactCertificate):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    # Same attribute surface as Certificate, so CertificateChain and
+    # CertificateVisualizer can use compact certificates directly
+    @property
+    def valid_from(self):
+        return from_epoch(self.valid_from_us)
+
+    @property
+    def valid_to(self):
+        return from_epoch(self.valid_to_us)
+
+    @property
+    def serial_number(self):
+        if isinstance(self.serial, int):
+            return str(uuid.UUID(int=self.serial))
+        return self.serial
+
+    @classmethod
+    def from_certificate(cls, cert):
+        return cls(
+            subject=cert.subject,
+            issuer=cert.issuer,
+            valid_from_us=to_epoch(cert.valid_from),
+            valid_to_us=to_epoch(cert.valid_to),
+            is_root=cert.is_root,
+            serial=pack_serial(cert.serial_number)
+        )
+
+    def to_certificate(self):
+        return Certificate(
+            subject=self.subject,
+            issuer=self.issuer,
+            valid_from=self.valid_from,
+            valid_to=self.valid_to,
+            is_root=self.is_root,
+            serial_number=self.serial_number
+        )
+
+def pack_serial(serial_number):
+    try:
+        value = uuid.UUID(serial_number)
+    except ValueError:
+        return sys.intern(serial_number)
+    # Only canonical UUID strings round-trip through the integer form
+    if str(value) != serial_number:
+        return sys.intern(serial_number)
+    return value.int
+
+def measure_memory(count=100000):
+    # Bytes per certificate for a leaf population sharing one issuer
+    root = Certificate.create_root_ca()
+    intermediate = Certificate.create_intermediate(root)
+    # Names are interned up front so neither side is charged for the strings
+    names = [sys.intern(f"host{i}.example.com") for i in range(count)]
+
+    def build_full():
+        return [Certificate.create_leaf(intermediate, name=name) for name in names]
+
+    def build_compact():
+        return [CompactCertificate.from_certificate(Certificate.create_leaf(intermediate, name=name))
+                for name in names]
+
+    results = {}
+    for label, build in (("certificate", build_full), ("compact", build_compact)):
+        tracemalloc.start()
+        certs = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = current / count
+        del certs
+    return results
+
+if __name__ == "__main__":
+    sizes = measure_memory()
+    for label, size in sizes.items():
+        print(f"{label:<12} {size:8.1f} bytes/certificate")
+    print(f"{'saved':<12} {1 - sizes['compact'] / sizes['certificate']:8.1%}")
@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from itertools import count
+from .certificate import CertificateChain
+
+@dataclass
+class StatusChange:
+    chain_id: object
+    was_valid: bool
+    is_valid: bool
+    message: str
+
+class DependencyGraph:
+    def __init__(self):
+        self.chains = {}
+        self.trust_flags = {}
+        self.results = {}
+        # serial -> chains containing the certificate
+        self.by_serial = {}
+        # issuer subject -> chains that rely on a certificate with that subject
+        self.dependents = {}
+        self._chain_ids = count()
+
+    def __len__(self):
+        return len(self.chains)
+
+    def _link(self, chain_id, chain):
+        for cert in chain.certificates:
+            self.by_serial.setdefault(cert.serial_number, set()).add(chain_id)
+            self.dependents.setdefault(cert.issuer, set()).add(chain_id)
+            self.dependents.setdefault(cert.subject, set()).add(chain_id)
+
+    def _unlink(self, chain_id, chain):
+        for cert in chain.certificates:
+            for index, key in ((self.by_serial, cert.serial_number),
+                               (self.dependents, cert.issuer),
+                               (self.dependents, cert.subject)):
+                chain_ids = index.get(key)
+                if chain_ids is not None:
+                    chain_ids.discard(chain_id)
+                    if not chain_ids:
+                        del index[key]
+
+    def add_chain(self, chain, chain_id=None, trust_server_certificate=False):
+        if chain_id is None:
+            chain_id = next(self._chain_ids)
+        if chain_id in self.chains:
+            self.remove_chain(chain_id)
+        # Keep a private copy since certificates get swapped in place on updates
+        stored = CertificateChain()
+        stored.certificates = list(chain.certificates)
+        self.chains[chain_id] = stored
+        self.trust_flags[chain_id] = trust_server_certificate
+        self.results[chain_id] = stored.validate(trust_server_certificate)
+        self._link(chain_id, stored)
+        return chain_id
+
+    def remove_chain(self, chain_id):
+        chain = self.chains.pop(chain_id, None)
+        if chain is None:
+            return False
+        self._unlink(chain_id, chain)
+        del self.trust_flags[chain_id]
+        del self.results[chain_id]
+        return True
+
+    def result(self, chain_id):
+        return self.results[chain_id]
+
+    def _revalidate(self, chain_ids):
+        changes = []
+        for chain_id in chain_ids:
+            was_valid = self.results[chain_id][0]
+            result, message = self.chains[chain_id].validate(self.trust_flags[chain_id])
+            self.results[chain_id] = (result, message)
+            if result != was_valid:
+                changes.append(StatusChange(chain_id, was_valid, result, message))
+        return changes
+
+    def _rewrite(self, old, new):
+        # Swap (or drop, when new is None) one certificate in every chain holding it
+        chain_ids = set(self.by_serial.get(old.serial_number, ()))
+        for chain_id in chain_ids:
+            chain = self.chains[chain_id]
+            self._unlink(chain_id, chain)
+            if new is None:
+                chain.certificates = [cert for cert in chain.certificates
+                                      if cert.serial_number != old.serial_number]
+            else:
+                chain.certificates = [new if cert.serial_number == old.serial_number else cert
+                                      for cert in chain.certificates]
+            self._link(chain_id, chain)
+        return chain_ids
+
+    def replace_certificate(self, old, new):
+        # Only chains that contain the old certificate are revalidated
+        return self._revalidate(self._rewrite(old, new))
+
+    def remove_certificate(self, cert):
+        return self._revalidate(self._rewrite(cert, None))
+
+    def revalidate_subject(self, subject):
+        # For changes outside the chains themselves, e.g. a CA's trust or clock
+        return self._revalidate(set(self.dependents.get(subject, ())))
+
+    def revalidate_all(self):
+        return self._revalidate(list(self.chains))
+
+    def affected_by(self, cert):
+        return set(self.by_serial.get(cert.serial_number, ())) | set(self.dependents.get(cert.subject, ()))
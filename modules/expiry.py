@@ -0,0 +1,212 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from itertools import chain as chained, count
+
+# Items per block of a SortedBlocks; blocks split at twice this
+BLOCK_SIZE = 1000
+LAST_CHAR = chr(0x10FFFF)
+
+class SortedBlocks:
+    # Sorted list kept as a list of sorted blocks, so an insert or delete
+    # shifts one block rather than half of everything
+    def __init__(self, items=()):
+        self._load(sorted(items))
+
+    def _load(self, items):
+        self.blocks = [items[i:i + BLOCK_SIZE] for i in range(0, len(items), BLOCK_SIZE)]
+        self.maxes = [block[-1] for block in self.blocks]
+        self.size = len(items)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    def add(self, item):
+        if not self.blocks:
+            self._load([item])
+            return
+        i = bisect_left(self.maxes, item)
+        if i == len(self.blocks):
+            i -= 1
+            self.blocks[i].append(item)
+            self.maxes[i] = item
+        else:
+            insort(self.blocks[i], item)
+        self.size += 1
+        block = self.blocks[i]
+        if len(block) > 2 * BLOCK_SIZE:
+            self.blocks[i:i + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            self.maxes[i:i + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+
+    def update(self, items):
+        items = list(items)
+        if len(items) <= BLOCK_SIZE:
+            for item in items:
+                self.add(item)
+        else:
+            # One sort over the existing run plus the new items
+            self._load(sorted(chained(self, items)))
+
+    def discard(self, item):
+        i = bisect_left(self.maxes, item)
+        if i == len(self.blocks):
+            return False
+        block = self.blocks[i]
+        j = bisect_left(block, item)
+        if block[j] != item:
+            return False
+        del block[j]
+        self.size -= 1
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+        return True
+
+    def locate(self, key, right=False):
+        # (block, offset) where key would be inserted, after equal items if right
+        search = bisect_right if right else bisect_left
+        i = search(self.maxes, key)
+        if i == len(self.blocks):
+            return i, 0
+        return i, search(self.blocks[i], key)
+
+    def between(self, start=None, stop=None):
+        # Items from position start up to position stop, both from locate()
+        i, j = start or (0, 0)
+        k, l = stop or (len(self.blocks), 0)
+        if (i, j) >= (k, l):
+            return []
+        if i == k:
+            return self.blocks[i][j:l]
+        items = self.blocks[i][j:]
+        for block in self.blocks[i + 1:k]:
+            items.extend(block)
+        if k < len(self.blocks):
+            items.extend(self.blocks[k][:l])
+        return items
+
+class ExpiryIndex:
+    def __init__(self):
+        # Sorted (timestamp, serial) pairs; the serial keeps keys unique
+        self.by_valid_to = SortedBlocks()
+        self.by_valid_from = SortedBlocks()
+        self.certificates = {}
+        # serial -> ids of the chains that contain the certificate
+        self.chains_by_serial = {}
+        self.chains = {}
+        self.standalone = set()
+        self._chain_ids = count()
+
+    def __len__(self):
+        return len(self.certificates)
+
+    def _insert(self, cert, pending=None):
+        # With pending, a ([valid_to keys], [valid_from keys]) pair, the keys
+        # are collected for one bulk update instead of inserted one by one
+        serial = cert.serial_number
+        if serial in self.certificates:
+            return
+        self.certificates[serial] = cert
+        if pending is None:
+            self.by_valid_to.add((cert.valid_to, serial))
+            self.by_valid_from.add((cert.valid_from, serial))
+        else:
+            pending[0].append((cert.valid_to, serial))
+            pending[1].append((cert.valid_from, serial))
+
+    def _delete(self, serial):
+        cert = self.certificates.pop(serial, None)
+        if cert is None:
+            return
+        self.by_valid_to.discard((cert.valid_to, serial))
+        self.by_valid_from.discard((cert.valid_from, serial))
+
+    def add(self, cert):
+        self.standalone.add(cert.serial_number)
+        self._insert(cert)
+
+    def remove(self, cert):
+        serial = cert.serial_number
+        self.standalone.discard(serial)
+        if not self.chains_by_serial.get(serial):
+            self._delete(serial)
+
+    def add_chain(self, chain, chain_id=None, _pending=None):
+        if chain_id is None:
+            chain_id = next(self._chain_ids)
+        if chain_id in self.chains:
+            self.remove_chain(chain_id)
+        self.chains[chain_id] = chain
+        for cert in chain.certificates:
+            self._insert(cert, _pending)
+            self.chains_by_serial.setdefault(cert.serial_number, set()).add(chain_id)
+        return chain_id
+
+    def add_chains(self, chains):
+        # Bulk load, e.g. a whole fleet: the sorted keys are merged in once at
+        # the end. Returns the new chain ids
+        pending = ([], [])
+        chain_ids = [self.add_chain(chain, _pending=pending) for chain in chains]
+        self.by_valid_to.update(pending[0])
+        self.by_valid_from.update(pending[1])
+        return chain_ids
+
+    def remove_chain(self, chain_id):
+        chain = self.chains.pop(chain_id, None)
+        if chain is None:
+            return False
+        for cert in chain.certificates:
+            serial = cert.serial_number
+            chain_ids = self.chains_by_serial.get(serial)
+            if chain_ids is not None:
+                chain_ids.discard(chain_id)
+                if not chain_ids:
+                    del self.chains_by_serial[serial]
+            # Certificates stay indexed while another chain or add() still references them
+            if serial not in self.chains_by_serial and serial not in self.standalone:
+                self._delete(serial)
+        return True
+
+    @staticmethod
+    def _range(entries, start, end):
+        # Inclusive on both ends; None leaves that side open
+        low = None if start is None else entries.locate((start,))
+        high = None if end is None else entries.locate((end, LAST_CHAR), right=True)
+        return entries.between(low, high)
+
+    def expiring_between(self, start, end):
+        return [self.certificates[serial] for _, serial in self._range(self.by_valid_to, start, end)]
+
+    def expiring_within(self, days, now=None):
+        # Certificates still valid now that expire within the next `days` days
+        now = now or datetime.now()
+        return self.expiring_between(now, now + timedelta(days=days))
+
+    def expired(self, at=None):
+        at = at or datetime.now()
+        entries = self.by_valid_to.between(None, self.by_valid_to.locate((at,)))
+        return [self.certificates[serial] for _, serial in entries]
+
+    def not_yet_valid(self, at=None):
+        at = at or datetime.now()
+        entries = self.by_valid_from.between(self.by_valid_from.locate((at, LAST_CHAR), right=True), None)
+        return [self.certificates[serial] for _, serial in entries]
+
+    def affected_chains(self, certificates):
+        # chain id -> the given certificates it contains, including via intermediates
+        affected = {}
+        for cert in certificates:
+            for chain_id in self.chains_by_serial.get(cert.serial_number, ()):
+                affected.setdefault(chain_id, []).append(cert)
+        return affected
+
+    def chains_expiring_between(self, start, end):
+        return self.affected_chains(self.expiring_between(start, end))
+
+    def chains_expiring_within(self, days, now=None):
+        return self.affected_chains(self.expiring_within(days, now))
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+import argparse
+import json
+import random
+from .certificate import Certificate, CertificateChain
+
+VALID = "valid"
+EXPIRED = "expired"
+BROKEN = "broken"
+UNTRUSTED = "untrusted"
+
+ROOT_LIFETIME = timedelta(days=3650)
+INTERMEDIATE_LIFETIME = timedelta(days=730)
+LEAF_LIFETIME = timedelta(days=365)
+
+class HierarchyGenerator:
+    def __init__(self, seed=0, roots=1, fan_out=2, depth=1, leaves=1000,
+                 expired_fraction=0.0, broken_fraction=0.0, untrusted_fraction=0.0,
+                 base_time=None):
+        if roots < 1 or fan_out < 1 or depth < 0 or leaves < 0:
+            raise ValueError("roots and fan_out must be positive, depth and leaves non-negative")
+        if expired_fraction + broken_fraction + untrusted_fraction > 1:
+            raise ValueError("Chain fractions must not add up to more than 1")
+        self.rng = random.Random(seed)
+        self.roots = roots
+        self.fan_out = fan_out
+        self.depth = depth
+        self.leaves = leaves
+        self.expired_fraction = expired_fraction
+        self.broken_fraction = broken_fraction
+        self.untrusted_fraction = untrusted_fraction
+        # Every certificate is dated from one timestamp instead of calling now() per cert
+        self.base_time = base_time or datetime.now()
+        self.authorities = []
+        self.issuing_paths = []
+
+    def _serial(self):
+        # Same canonical form as str(uuid.uuid4()), without the uuid round trip
+        h = f"{self.rng.getrandbits(128):032x}"
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+    def build_authorities(self):
+        # Returns the CA certificates; issuing_paths holds the issuer path
+        # (bottom intermediate first, root last) that leaves are attached to
+        if self.authorities:
+            return self.authorities
+        base = self.base_time
+        for r in range(self.roots):
+            name = f"Root CA {r}"
+            root = Certificate(name, name, base, base + ROOT_LIFETIME, True, self._serial())
+            self.authorities.append(root)
+            level = [(root,)]
+            for d in range(self.depth):
+                next_level = []
+                for path in level:
+                    parent = path[0]
+                    for f in range(self.fan_out):
+                        name = f"{parent.subject} / Intermediate {d}.{f}"
+                        cert = Certificate(name, parent.subject, base,
+                                           base + INTERMEDIATE_LIFETIME, False, self._serial())
+                        self.authorities.append(cert)
+                        next_level.append((cert,) + path)
+                level = next_level
+            self.issuing_paths.extend(level)
+        return self.authorities
+
+    def chains(self):
+        # Yields (kind, chain); CA certificates are shared between chains
+        self.build_authorities()
+        base = self.base_time
+        rng = self.rng
+        paths = self.issuing_paths
+        expired_limit = self.expired_fraction
+        broken_limit = expired_limit + self.broken_fraction
+        untrusted_limit = broken_limit + self.untrusted_fraction
+        leaf_to = base + LEAF_LIFETIME
+        expired_from = base - timedelta(days=730)
+        expired_to = base - timedelta(days=365)
+
+        for i in range(self.leaves):
+            path = paths[rng.randrange(len(paths))]
+            issuer = path[0]
+            roll = rng.random()
+            name = f"host{i}.example.com"
+            chain = CertificateChain()
+
+            if roll < expired_limit:
+                kind = EXPIRED
+                leaf = Certificate(name, issuer.subject, expired_from, expired_to, False, self._serial())
+            elif roll < broken_limit:
+                kind = BROKEN
+                leaf = Certificate(name, "Wrong Issuer", base, leaf_to, False, self._serial())
+            elif roll < untrusted_limit:
+                kind = UNTRUSTED
+                chain.add_certificate(Certificate(name, "Unknown CA", base, leaf_to, False, self._serial()))
+                yield kind, chain
+                continue
+            else:
+                kind = VALID
+                leaf = Certificate(name, issuer.subject, base, leaf_to, False, self._serial())
+
+            chain.certificates = [leaf, *path]
+            yield kind, chain
+
+def write_jsonl(path, chains):
+    # Writes the record format read by --validate-file; untrusted chains get the
+    # trust flag like the Trust Server Certificate scenario
+    count = 0
+    with open(path, "w", encoding="utf-8") as output:
+        for kind, chain in chains:
+            record = {
+                "certificates": [cert.to_dict() for cert in chain.certificates],
+                "trust_server_certificate": kind == UNTRUSTED,
+            }
+            output.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic PKI hierarchy as JSONL chains")
+    parser.add_argument("output", help="JSONL file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--roots", type=int, default=1)
+    parser.add_argument("--fan-out", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--leaves", type=int, default=1000)
+    parser.add_argument("--expired", type=float, default=0.0, help="Fraction of expired leaves")
+    parser.add_argument("--broken", type=float, default=0.0, help="Fraction of broken-issuer leaves")
+    parser.add_argument("--untrusted", type=float, default=0.0, help="Fraction of standalone leaves")
+    parser.add_argument("--base-time", type=datetime.fromisoformat, metavar="ISO",
+                        help="Timestamp every certificate is dated from (default: now); with --seed, "
+                             "fixing it makes the output byte-for-byte reproducible")
+    args = parser.parse_args()
+
+    generator = HierarchyGenerator(
+        seed=args.seed, roots=args.roots, fan_out=args.fan_out, depth=args.depth,
+        leaves=args.leaves, expired_fraction=args.expired, broken_fraction=args.broken,
+        untrusted_fraction=args.untrusted, base_time=args.base_time
+    )
+    count = write_jsonl(args.output, generator.chains())
+    print(f"Wrote {count} chains ({len(generator.authorities)} CA certificates) to {args.output}")
+
+if __name__ == "__main__":
+    main()
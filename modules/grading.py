@@ -0,0 +1,207 @@
+import argparse
+import json
+import random
+import time
+from itertools import islice
+from .ingest import open_source
+from .questions import QUESTIONS, load_questions, save_questions, score_band, EXCELLENT, GOOD, REVIEW
+
+try:
+    import numpy as np
+except ImportError:  # numpy is the optional 'batch' extra
+    np = None
+
+# Answer sheets are JSONL, one learner per line:
+#   {"learner": "alice", "answers": ["b", "c", null, ...]}   answers in question order
+#   {"learner": "bob", "answers": {"1": "b", "3": "d"}}       1-based question numbers
+# Blank, missing and unknown answers count as unanswered (and wrong).
+
+DEFAULT_CHUNK_SIZE = 10000
+# Answer codes: 0 is unanswered, 1..26 are options "a".."z"
+CODES = {chr(ord("a") + i): i + 1 for i in range(26)}
+CODES.update({letter.upper(): code for letter, code in CODES.items()})
+OPTION_SLOTS = 27
+BANDS = (EXCELLENT, GOOD, REVIEW)
+
+def encode_answers(answers, count):
+    if isinstance(answers, dict):
+        row = [0] * count
+        for number, answer in answers.items():
+            try:
+                index = int(number) - 1
+            except (ValueError, TypeError):
+                continue  # not a question number, so nothing is answered
+            if 0 <= index < count:
+                row[index] = CODES.get(answer, 0)
+        return row
+    if isinstance(answers, list):
+        row = [CODES.get(answer, 0) if isinstance(answer, str) else 0 for answer in answers[:count]]
+        row.extend([0] * (count - len(row)))
+        return row
+    raise ValueError("answers must be a list or an object")
+
+class CohortGrader:
+    def __init__(self, questions=QUESTIONS):
+        self.questions = list(questions)
+        self.count = len(self.questions)
+        self.key = [CODES[question.correct_answer] for question in self.questions]
+        # Per question, how often each answer code was given (column 0: unanswered)
+        self.option_counts = [[0] * OPTION_SLOTS for _ in range(self.count)]
+        self.learners = 0
+        self.skipped = 0
+        self.score_total = 0
+        self.bands = dict.fromkeys(BANDS, 0)
+
+    def parse_sheets(self, lines):
+        # (learner ids, answer rows) for a chunk of JSONL lines; bad lines are skipped
+        learners, rows = [], []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                sheet = json.loads(line)
+                rows.append(encode_answers(sheet["answers"], self.count))
+                learners.append(sheet.get("learner", self.learners + len(learners) + self.skipped))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                self.skipped += 1
+        return learners, rows
+
+    def grade_rows(self, rows):
+        # Scores for an answer matrix; also folds the rows into the cohort stats
+        if not rows:
+            return []
+        if np is None:
+            return self._grade_rows_python(rows)
+        matrix = np.array(rows, dtype=np.uint8)
+        scores = (matrix == np.array(self.key, dtype=np.uint8)).sum(axis=1)
+        # One bincount over (question, code) pairs gives every option's count
+        cells = (np.arange(self.count, dtype=np.intp) * OPTION_SLOTS + matrix).ravel()
+        counts = np.bincount(cells, minlength=self.count * OPTION_SLOTS).reshape(self.count, OPTION_SLOTS)
+        for question_counts, chunk_counts in zip(self.option_counts, counts.tolist()):
+            for code, value in enumerate(chunk_counts):
+                question_counts[code] += value
+        return scores.tolist()
+
+    def _grade_rows_python(self, rows):
+        scores = []
+        for row in rows:
+            scores.append(sum(answer == correct for answer, correct in zip(row, self.key)))
+            for question_counts, answer in zip(self.option_counts, row):
+                question_counts[answer] += 1
+        return scores
+
+    def grade(self, lines):
+        # Yields one result dict per learner in the chunk
+        learners, rows = self.parse_sheets(lines)
+        for learner, score in zip(learners, self.grade_rows(rows)):
+            percentage = score / self.count * 100
+            band = score_band(percentage)
+            self.learners += 1
+            self.score_total += score
+            self.bands[band] += 1
+            yield {"learner": learner, "score": score, "total": self.count,
+                   "percentage": round(percentage, 1), "band": band}
+
+    def question_stats(self):
+        stats = []
+        for number, (question, counts) in enumerate(zip(self.questions, self.option_counts), 1):
+            responses = sum(counts)
+            correct_code = CODES[question.correct_answer]
+            wrong = [(counts[CODES[option]], option) for option in question.options
+                     if option != question.correct_answer and counts[CODES[option]]]
+            stats.append({
+                "question": number,
+                "text": question.text,
+                # Share of learners who got it right: lower means harder
+                "correct_rate": counts[correct_code] / responses if responses else 0.0,
+                "unanswered_rate": counts[0] / responses if responses else 0.0,
+                "most_common_wrong": max(wrong)[1] if wrong else None,
+                "answers": {option: counts[CODES[option]] for option in question.options},
+            })
+        return stats
+
+    def summary(self):
+        return {
+            "learners": self.learners,
+            "skipped": self.skipped,
+            "mean_percentage": self.score_total / (self.learners * self.count) * 100 if self.learners else 0.0,
+            "bands": dict(self.bands),
+            "questions": self.question_stats(),
+        }
+
+def grade_file(path, questions=QUESTIONS, output=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Streams sheets through the grader a chunk at a time, writing results as
+    # JSONL to `output` (a path) when given
+    grader = CohortGrader(questions)
+    started = time.perf_counter()
+    out = open(output, "w", encoding="utf-8") if output else None
+    try:
+        with open_source(path) as source:
+            while True:
+                chunk = list(islice(source, chunk_size))
+                if not chunk:
+                    break
+                for result in grader.grade(chunk):
+                    if out is not None:
+                        out.write(json.dumps(result) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+    summary = grader.summary()
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+def write_sample_sheets(path, count, questions=QUESTIONS, seed=0):
+    # Synthetic cohort for load testing: each learner has a skill level that
+    # sets their chance of knowing each answer
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as output:
+        for i in range(count):
+            skill = rng.random()
+            answers = []
+            for question in questions:
+                roll = rng.random()
+                if roll < 0.02:
+                    answers.append(None)
+                elif roll < skill:
+                    answers.append(question.correct_answer)
+                else:
+                    answers.append(rng.choice(list(question.options)))
+            output.write(json.dumps({"learner": f"learner{i}", "answers": answers}) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade quiz answer sheets in bulk")
+    parser.add_argument("sheets", nargs="?", help="JSONL answer sheets (.gz supported)")
+    parser.add_argument("--questions", metavar="PATH", help="JSON question bank (default: built-in quiz)")
+    parser.add_argument("--output", metavar="PATH", help="Write per-learner results as JSONL")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--generate", type=int, metavar="N", help="Write N synthetic sheets to SHEETS and exit")
+    parser.add_argument("--export-questions", metavar="PATH", help="Write the question bank as JSON and exit")
+    args = parser.parse_args()
+
+    try:
+        questions = load_questions(args.questions) if args.questions else QUESTIONS
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.export_questions:
+        save_questions(args.export_questions, questions)
+        return
+    if not args.sheets:
+        parser.error("the sheets file is required unless --export-questions is given")
+    if args.generate:
+        write_sample_sheets(args.sheets, args.generate, questions)
+        return
+
+    summary = grade_file(args.sheets, questions, args.output, args.chunk_size)
+    print(f"Graded {summary['learners']:,} learners in {summary['seconds']:.2f}s"
+          f" ({summary['skipped']:,} sheets skipped)")
+    print(f"Mean score: {summary['mean_percentage']:.1f}%")
+    for band in BANDS:
+        print(f"  {band:<10} {summary['bands'][band]:,}")
+    print("\nQuestion  Correct  Unanswered  Most common wrong answer")
+    for stats in summary["questions"]:
+        print(f"{stats['question']:>8}  {stats['correct_rate']:>7.1%}  {stats['unanswered_rate']:>10.1%}"
+              f"  {stats['most_common_wrong'] or '-'}")
+
+if __name__ == "__main__":
+    main()
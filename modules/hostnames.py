@@ -0,0 +1,93 @@
+class _Node:
+    __slots__ = ("children", "exact", "wildcard")
+
+    def __init__(self):
+        self.children = {}
+        # (certificate, chain or None) entries for "name" and "*.name" subjects
+        self.exact = []
+        self.wildcard = []
+
+def _labels(name):
+    # Reversed DNS labels, so names under one domain share a trie path
+    return name.strip().rstrip(".").lower().split(".")[::-1]
+
+class HostnameIndex:
+    def __init__(self, chain_builder=None):
+        # chain_builder(leaf) -> CertificateChain, e.g. TrustStore.build_chain or
+        # PathBuilder.build_chain, used for certificates added without a chain
+        self.root = _Node()
+        self.chain_builder = chain_builder
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _node(self, labels, create=False):
+        node = self.root
+        for label in labels:
+            child = node.children.get(label)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[label] = _Node()
+            node = child
+        return node
+
+    def add(self, cert, chain=None):
+        labels = _labels(cert.subject)
+        if labels[-1] == "*":
+            # "*.example.com" covers exactly one extra label, so it sits on
+            # the example.com node and is checked one level above the host
+            self._node(labels[:-1], create=True).wildcard.append((cert, chain))
+        else:
+            self._node(labels, create=True).exact.append((cert, chain))
+        self.count += 1
+
+    def add_chain(self, chain):
+        if chain.certificates:
+            self.add(chain.certificates[0], chain)
+
+    def remove(self, cert):
+        labels = _labels(cert.subject)
+        wildcard = labels[-1] == "*"
+        node = self._node(labels[:-1] if wildcard else labels)
+        if node is None:
+            return False
+        entries = node.wildcard if wildcard else node.exact
+        for i, (stored, _) in enumerate(entries):
+            if stored.serial_number == cert.serial_number:
+                del entries[i]
+                self.count -= 1
+                return True
+        return False
+
+    def _matches(self, hostname):
+        labels = _labels(hostname)
+        if not labels[-1]:
+            return []
+        # Only the parent of the host can hold a covering wildcard, and
+        # wildcards never match bare labels like "com"
+        parent = self._node(labels[:-1]) if len(labels) > 2 else None
+        node = self._node(labels)
+        matches = list(node.exact) if node is not None else []
+        if parent is not None and labels[-1] != "*":
+            matches.extend(parent.wildcard)
+        return matches
+
+    def lookup(self, hostname):
+        # Certificates whose subject covers hostname; cost depends on the
+        # number of labels in hostname, not on the size of the index
+        return [cert for cert, _ in self._matches(hostname)]
+
+    def resolve(self, hostname, trust_server_certificate=False, revocation=None):
+        # [(certificate, chain, (valid, message))] for each covering certificate,
+        # valid matches first
+        results = []
+        for cert, chain in self._matches(hostname):
+            if chain is None:
+                if self.chain_builder is None:
+                    raise ValueError("No chain stored for certificate and no chain_builder given")
+                chain = self.chain_builder(cert)
+            results.append((cert, chain, chain.validate(trust_server_certificate, revocation)))
+        results.sort(key=lambda entry: not entry[2][0])
+        return results
@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+import csv
+import gzip
+import json
+from .certificate import Certificate, CertificateChain
+
+# Supported layouts, both read one record at a time:
+#   JSONL chain records:  {"chain_id": ..., "certificates": [...], "trust_server_certificate": false}
+#   JSONL or CSV rows:    one certificate per row with a chain_id column; rows of a
+#                         chain must be contiguous and ordered leaf -> root
+CSV_FIELDS = ["chain_id", "subject", "issuer", "valid_from", "valid_to",
+              "is_root", "serial_number", "trust_server_certificate"]
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+@dataclass
+class IngestError:
+    line: int
+    message: str
+    chain_id: str = None
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    return str(value).strip().lower() in TRUE_VALUES
+
+def parse_chain_record(record, pool=None):
+    # With a CertificatePool, repeated CA certificates come back as one shared
+    # object; the leaf (first certificate) is never pooled
+    chain = CertificateChain()
+    for i, data in enumerate(record["certificates"]):
+        chain.add_certificate(Certificate.from_dict(data) if pool is None else pool.from_dict(data, leaf=i == 0))
+    return chain, parse_bool(record.get("trust_server_certificate"))
+
+def open_source(path):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+def detect_format(path):
+    name = str(path)
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return "csv" if name.endswith(".csv") else "jsonl"
+
+class CertificateReader:
+    def __init__(self, path, format=None, on_error=None, pool=None):
+        self.path = path
+        self.format = format or detect_format(path)
+        if self.format not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported format: {self.format}")
+        self.on_error = on_error
+        self.error_count = 0
+        self.pool = pool
+
+    def _from_dict(self, record, leaf):
+        if self.pool is None:
+            return Certificate.from_dict(record)
+        return self.pool.from_dict(record, leaf)
+
+    def _error(self, line, message, chain_id=None):
+        self.error_count += 1
+        if self.on_error is not None:
+            self.on_error(IngestError(line, message, chain_id))
+
+    def _rows(self):
+        # Yields (line number, parsed record) and reports lines that can't be parsed
+        with open_source(self.path) as source:
+            if self.format == "csv":
+                reader = csv.DictReader(source)
+                for row in reader:
+                    if None in row:
+                        self._error(reader.line_num, "Too many columns", row.get("chain_id"))
+                        continue
+                    row["is_root"] = parse_bool(row.get("is_root"))
+                    yield reader.line_num, row
+            else:
+                for line_num, line in enumerate(source, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        self._error(line_num, f"Invalid JSON: {e}")
+                        continue
+                    if not isinstance(record, dict):
+                        self._error(line_num, "Record is not an object")
+                        continue
+                    yield line_num, record
+
+    def certificates(self):
+        for line_num, record in self._rows():
+            if "certificates" in record:
+                self._error(line_num, "Chain record where a certificate was expected", record.get("chain_id"))
+                continue
+            try:
+                # Only roots are pooled here: without a chain there's no telling
+                # which other certificates are CAs
+                yield self._from_dict(record, leaf=not parse_bool(record.get("is_root")))
+            except (ValueError, KeyError, TypeError) as e:
+                self._error(line_num, f"Malformed certificate: {e}", record.get("chain_id"))
+
+    def chains(self, include_skipped=False):
+        # Yields (chain_id, chain, trust_server_certificate). Only the chain being
+        # assembled is held in memory, so memory stays flat for any input size.
+        # With include_skipped, malformed chains come through with chain None
+        # so callers can keep their output aligned with the input
+        current_id = None
+        current = None
+        trust_flag = False
+        broken = False
+
+        for line_num, record in self._rows():
+            if "certificates" in record:
+                if current is not None and (include_skipped or not broken):
+                    yield current_id, None if broken else current, trust_flag
+                current = None
+                chain_id = record.get("chain_id", line_num)
+                try:
+                    chain, flag = parse_chain_record(record, self.pool)
+                except (ValueError, KeyError, TypeError) as e:
+                    self._error(line_num, f"Malformed chain: {e}", chain_id)
+                    if include_skipped:
+                        yield chain_id, None, parse_bool(record.get("trust_server_certificate"))
+                    continue
+                yield chain_id, chain, flag
+                continue
+
+            chain_id = record.get("chain_id")
+            if chain_id in (None, ""):
+                self._error(line_num, "Missing chain_id")
+                continue
+
+            if chain_id != current_id or current is None:
+                if current is not None and (include_skipped or not broken):
+                    yield current_id, None if broken else current, trust_flag
+                current_id = chain_id
+                current = CertificateChain()
+                trust_flag = parse_bool(record.get("trust_server_certificate"))
+                broken = False
+
+            if broken:
+                continue
+            try:
+                current.add_certificate(self._from_dict(record, leaf=not current.certificates))
+            except (ValueError, KeyError, TypeError) as e:
+                # A chain with a missing link would validate misleadingly, so skip it
+                self._error(line_num, f"Malformed certificate (chain skipped): {e}", chain_id)
+                broken = True
+
+        if current is not None and (include_skipped or not broken):
+            yield current_id, None if broken else current, trust_flag
+
+def write_csv_rows(output, chain_id, chain, trust_server_certificate=False):
+    writer = csv.writer(output)
+    for cert in chain.certificates:
+        data = cert.to_dict()
+        writer.writerow([chain_id, data["subject"], data["issuer"], data["valid_from"],
+                         data["valid_to"], data["is_root"], data["serial_number"],
+                         trust_server_certificate])
@@ -0,0 +1,174 @@
+from datetime import datetime
+from .certificate import CertificateChain
+
+SHORTEST = "shortest"
+LONGEST_VALIDITY = "longest_validity"
+POLICIES = (SHORTEST, LONGEST_VALIDITY)
+NO_CUTS = frozenset()
+
+class CertificatePath:
+    # One certificate plus the path above it. Paths are linked upwards, so
+    # every leaf under an intermediate shares that intermediate's path objects
+    # instead of holding its own copy of them
+    __slots__ = ("certificate", "parent", "length", "valid_to")
+
+    def __init__(self, certificate, parent=None):
+        self.certificate = certificate
+        self.parent = parent
+        if parent is None:
+            self.length = 1
+            self.valid_to = certificate.valid_to
+        else:
+            self.length = parent.length + 1
+            self.valid_to = min(certificate.valid_to, parent.valid_to)
+
+    def __iter__(self):
+        node = self
+        while node is not None:
+            yield node.certificate
+            node = node.parent
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def root(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node.certificate
+
+    def to_chain(self):
+        chain = CertificateChain()
+        chain.certificates = list(self)
+        return chain
+
+def _without_loops(paths, visiting, cuts):
+    # Memoized paths were built without knowing the current search path, so
+    # drop any that pass back through it (recording where they were cut)
+    for path in paths:
+        looping = [cert.subject for cert in path if cert.subject in visiting]
+        if looping:
+            cuts.update(looping)
+        else:
+            yield path
+
+class PathBuilder:
+    def __init__(self, find_issuers, at=None, max_length=16, revocation=None):
+        # find_issuers is TrustStore.find_issuers or anything shaped like it.
+        # Paths are only valid as of one time, so the memo is tied to `at`
+        self.find_issuers = find_issuers
+        self.now = at or datetime.now()
+        self.max_length = max_length
+        self.revocation = revocation
+        # serial -> tuple of valid paths starting at that issuer
+        self.memo = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _usable(self, cert):
+        if not cert.valid_from <= self.now <= cert.valid_to:
+            return False
+        return self.revocation is None or not self.revocation.is_revoked(cert.serial_number)
+
+    def _paths(self, cert, visiting):
+        # Returns (paths, cuts). `visiting` holds the subjects on the current
+        # search path; an issuer whose subject is already on it would loop
+        # (cross-signed CAs often sign each other), so it is skipped and its
+        # subject reported in `cuts`. A result is only memoized when nothing
+        # above it was cut except its own subject: then it doesn't depend on
+        # where the search came from, and every leaf can share it
+        serial = cert.serial_number
+        cached = self.memo.get(serial)
+        if cached is not None:
+            self.hits += 1
+            # Memoized paths may have been found from a shallower start; keep
+            # only those that still fit under max_length from here
+            room = self.max_length - len(visiting)
+            if all(path.length <= room for path in cached):
+                return cached, NO_CUTS
+            return tuple(path for path in cached if path.length <= room), frozenset(visiting)
+        self.misses += 1
+
+        if cert.is_root:
+            paths = (CertificatePath(cert),)
+            self.memo[serial] = paths
+            return paths, NO_CUTS
+        # A self-issued certificate that isn't a root can't lead anywhere
+        if cert.issuer == cert.subject:
+            self.memo[serial] = ()
+            return (), NO_CUTS
+        if len(visiting) >= self.max_length - 1:
+            # Too deep from here; some other search may still fit under the limit
+            return (), frozenset(visiting)
+
+        visiting.add(cert.subject)
+        paths = []
+        cuts = set()
+        for issuer in self.find_issuers(cert):
+            if issuer.subject in visiting:
+                cuts.add(issuer.subject)
+                continue
+            if not self._usable(issuer):
+                continue
+            above, issuer_cuts = self._paths(issuer, visiting)
+            cuts.update(issuer_cuts)
+            paths.extend(CertificatePath(cert, parent) for parent in _without_loops(above, visiting, cuts))
+        visiting.discard(cert.subject)
+
+        paths = tuple(paths)
+        cuts.discard(cert.subject)
+        if not cuts:
+            self.memo[serial] = paths
+        return paths, cuts
+
+    def paths(self, leaf):
+        # Every valid leaf->root path, as of self.now. The leaf's own result
+        # isn't memoized: leaves are rarely shared and there may be millions
+        if not self._usable(leaf):
+            return []
+        if leaf.is_root:
+            return [CertificatePath(leaf)]
+        if leaf.issuer == leaf.subject:
+            return []
+        visiting = {leaf.subject}
+        found = []
+        for issuer in self.find_issuers(leaf):
+            if issuer.subject in visiting or not self._usable(issuer):
+                continue
+            above, _ = self._paths(issuer, visiting)
+            found.extend(CertificatePath(leaf, parent) for parent in _without_loops(above, visiting, set()))
+        return found
+
+    def preferred_path(self, leaf, policy=SHORTEST):
+        found = self.paths(leaf)
+        if not found:
+            return None
+        if policy == SHORTEST:
+            # Ties go to the path that stays valid longest
+            return min(found, key=lambda path: (path.length, -path.valid_to.timestamp()))
+        if policy == LONGEST_VALIDITY:
+            return max(found, key=lambda path: (path.valid_to, -path.length))
+        raise ValueError(f"Unknown path policy: {policy!r} (expected one of {', '.join(POLICIES)})")
+
+    def build_chain(self, leaf, policy=SHORTEST):
+        # Same contract as TrustStore.build_chain: a bare leaf when no valid
+        # path exists, so validate() can report why
+        path = self.preferred_path(leaf, policy)
+        if path is not None:
+            return path.to_chain()
+        chain = CertificateChain()
+        chain.add_certificate(leaf)
+        return chain
+
+    def clear(self):
+        # Call after changing the store: adding or removing a certificate can
+        # change the paths of everything below it, transitively
+        self.memo.clear()
+
+    def stats(self):
+        return {
+            "memoized": len(self.memo),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,169 @@
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import datetime
+import json
+
+# Pin files are JSON objects mapping a hostname (or any leaf subject) to the
+# serials of the CA certificates allowed to appear above it:
+#   {"bank.example.com": ["<root serial>", "<intermediate serial>"], "*.example.org": [...]}
+# A chain for a pinned name passes when a pinned CA certificate is reached by
+# following issuer links up from the leaf; certificates appended past a broken
+# link don't count, since the trust bypass skips the linkage check.
+
+@dataclass
+class PinViolation:
+    observed_at: datetime
+    hostname: str
+    leaf_serial: str
+    presented: tuple
+
+    def to_dict(self):
+        return {
+            "observed_at": self.observed_at.isoformat(),
+            "hostname": self.hostname,
+            "leaf_serial": self.leaf_serial,
+            "presented": list(self.presented),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            observed_at=datetime.fromisoformat(data["observed_at"]),
+            hostname=data["hostname"],
+            leaf_serial=data["leaf_serial"],
+            presented=tuple(data["presented"])
+        )
+
+class PinViolationLog:
+    # Indexed as violations are recorded, so queries never rescan the log.
+    # With a path, every violation is also appended there as a JSON line
+    # through one handle kept open until close()
+    def __init__(self, path=None):
+        self.entries = []
+        self.by_hostname = {}
+        self.by_serial = {}
+        # Sorted (observed_at, entry index) pairs
+        self.by_time = []
+        self.path = path
+        self._output = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def _index(self, violation):
+        position = len(self.entries)
+        self.entries.append(violation)
+        self.by_hostname.setdefault(violation.hostname, []).append(position)
+        for serial in violation.presented:
+            self.by_serial.setdefault(serial, []).append(position)
+        insort(self.by_time, (violation.observed_at, position))
+
+    def record(self, violation):
+        self._index(violation)
+        if self.path is not None:
+            if self._output is None:
+                self._output = open(self.path, "a", encoding="utf-8")
+            self._output.write(json.dumps(violation.to_dict()) + "\n")
+
+    def flush(self):
+        if self._output is not None:
+            self._output.flush()
+
+    def close(self):
+        if self._output is not None:
+            self._output.close()
+            self._output = None
+
+    @classmethod
+    def load(cls, path):
+        # Reopens a persisted log; new violations keep appending to it
+        log = cls()
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                if line.strip():
+                    log._index(PinViolation.from_dict(json.loads(line)))
+        log.path = path
+        return log
+
+    def for_hostname(self, hostname):
+        return [self.entries[i] for i in self.by_hostname.get(_normalize(hostname), ())]
+
+    def for_serial(self, serial_number):
+        # Violations in which the given CA certificate was presented
+        return [self.entries[i] for i in self.by_serial.get(serial_number, ())]
+
+    def between(self, start, end):
+        low = bisect_left(self.by_time, (start, -1))
+        high = bisect_right(self.by_time, (end, len(self.entries)))
+        return [self.entries[i] for _, i in self.by_time[low:high]]
+
+    def counts_by_hostname(self):
+        return {hostname: len(positions) for hostname, positions in self.by_hostname.items()}
+
+def _normalize(name):
+    return name.strip().rstrip(".").lower()
+
+class PinStore:
+    def __init__(self, pins=None, log=None):
+        self.pins = {}
+        self.log = log
+        for name, serials in (pins or {}).items():
+            self.add(name, serials)
+
+    @classmethod
+    def load(cls, path, log=None):
+        with open(path, encoding="utf-8") as source:
+            data = json.load(source)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected an object mapping names to serial lists")
+        for name, serials in data.items():
+            # A bare string would otherwise become a set of its characters
+            if not isinstance(serials, list) or not all(isinstance(serial, str) for serial in serials):
+                raise ValueError(f"{path}: pins for {name!r} must be a list of serial strings")
+        return cls(data, log)
+
+    def __len__(self):
+        return len(self.pins)
+
+    def add(self, name, serials):
+        name = _normalize(name)
+        self.pins[name] = self.pins.get(name, frozenset()) | frozenset(serials)
+
+    def remove(self, name):
+        return self.pins.pop(_normalize(name), None) is not None
+
+    def allowed(self, hostname):
+        # Pinned serials for hostname: an exact pin, else a "*." pin on its parent
+        hostname = _normalize(hostname)
+        allowed = self.pins.get(hostname)
+        if allowed is None and "." in hostname:
+            allowed = self.pins.get("*." + hostname.split(".", 1)[1])
+        return allowed
+
+    def check(self, chain, at=None):
+        # None when the chain is unpinned or matches its pins, otherwise the
+        # failure message; violations are recorded in the log when there is one
+        if not chain.certificates:
+            return None
+        leaf = chain.certificates[0]
+        allowed = self.allowed(leaf.subject)
+        if allowed is None:
+            return None
+        certs = chain.certificates
+        for i in range(1, len(certs)):
+            if certs[i - 1].issuer != certs[i].subject:
+                break
+            if certs[i].serial_number in allowed:
+                return None
+        presented = tuple(cert.serial_number for cert in certs[1:])
+        if self.log is not None:
+            self.log.record(PinViolation(at or datetime.now(), _normalize(leaf.subject),
+                                         leaf.serial_number, presented))
+        return f"Pin violation: {leaf.subject} is not issued by a pinned CA"
@@ -0,0 +1,188 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+# Messages shared with CertificateChain.validate, so a default policy gives
+# exactly the same results
+from .certificate import NOT_ROOT_MESSAGE, TRUST_BYPASS_MESSAGE, VALID_MESSAGE
+
+@dataclass(frozen=True)
+class ValidationPolicy:
+    # allowed_roots holds root serials and/or subjects; None allows any root
+    max_length: int = None
+    allowed_roots: frozenset = None
+    clock_skew: timedelta = timedelta(0)
+    trust_server_certificate: bool = False
+    collect_all_errors: bool = False
+    # Compared by identity, like any object without its own __eq__
+    revocation: object = None
+    pins: object = None
+
+    def __post_init__(self):
+        if self.allowed_roots is not None and not isinstance(self.allowed_roots, frozenset):
+            object.__setattr__(self, "allowed_roots", frozenset(self.allowed_roots))
+        if self.max_length is not None and self.max_length < 1:
+            raise ValueError("max_length must be at least 1")
+        if self.clock_skew < timedelta(0):
+            raise ValueError("clock_skew must not be negative")
+
+    def compile(self):
+        return compile_policy(self)
+
+    def validate(self, chain, now=None):
+        # Fail-fast policies return (valid, message); all-errors policies
+        # return (valid, [message, ...]) with an empty list for a valid chain
+        return compile_policy(self)(chain, now)
+
+def _fail_fast_source(policy):
+    lines = [
+        "def validate(chain, now=None):",
+        "    certs = chain.certificates",
+        "    if not certs:",
+        "        return False, 'Empty chain'",
+    ]
+    if policy.max_length is not None:
+        lines += [
+            "    if len(certs) > MAX_LENGTH:",
+            "        return False, f'Chain has {len(certs)} certificates, more than the allowed {MAX_LENGTH}'",
+        ]
+    lines.append("    now = now or datetime_now()")
+    if policy.clock_skew:
+        lines.append("    not_before, not_after = now + CLOCK_SKEW, now - CLOCK_SKEW")
+    else:
+        lines.append("    not_before = not_after = now")
+    linkage = not policy.trust_server_certificate
+    if linkage:
+        # Linkage is checked in the same pass, but a date failure anywhere in
+        # the chain still wins, as in CertificateChain.validate
+        lines += [
+            "    link_error = None",
+            "    expected = certs[0].subject",
+            "    previous = None",
+        ]
+    lines += [
+        "    for cert in certs:",
+        "        if not_before < cert.valid_from:",
+        "            return False, f'Certificate for {cert.subject} is not yet valid'",
+        "        if not_after > cert.valid_to:",
+        "            return False, f'Certificate for {cert.subject} has expired'",
+    ]
+    if policy.revocation is not None:
+        lines += [
+            "        if REVOCATION.is_revoked(cert.serial_number):",
+            "            return False, f'Certificate for {cert.subject} has been revoked'",
+        ]
+    if linkage:
+        lines += [
+            "        if cert.subject != expected and link_error is None:",
+            "            link_error = f'Invalid issuer: {previous.subject} not issued by {cert.subject}'",
+            "        expected = cert.issuer",
+            "        previous = cert",
+        ]
+    if policy.pins is not None:
+        lines += [
+            "    violation = PINS.check(chain, now)",
+            "    if violation:",
+            "        return False, violation",
+        ]
+    if not linkage:
+        lines.append("    return True, TRUST_BYPASS_MESSAGE")
+        return lines
+    lines += [
+        "    if link_error is not None:",
+        "        return False, link_error",
+        "    root = certs[-1]",
+        "    if not root.is_root:",
+        "        return False, NOT_ROOT_MESSAGE",
+    ]
+    if policy.allowed_roots is not None:
+        lines += [
+            "    if root.serial_number not in ALLOWED_ROOTS and root.subject not in ALLOWED_ROOTS:",
+            "        return False, f'Root {root.subject} is not allowed by policy'",
+        ]
+    lines.append("    return True, VALID_MESSAGE")
+    return lines
+
+def _all_errors_source(policy):
+    lines = [
+        "def validate(chain, now=None):",
+        "    certs = chain.certificates",
+        "    if not certs:",
+        "        return False, ['Empty chain']",
+        "    errors = []",
+    ]
+    if policy.max_length is not None:
+        lines += [
+            "    if len(certs) > MAX_LENGTH:",
+            "        errors.append(f'Chain has {len(certs)} certificates, more than the allowed {MAX_LENGTH}')",
+        ]
+    lines.append("    now = now or datetime_now()")
+    if policy.clock_skew:
+        lines.append("    not_before, not_after = now + CLOCK_SKEW, now - CLOCK_SKEW")
+    else:
+        lines.append("    not_before = not_after = now")
+    linkage = not policy.trust_server_certificate
+    if linkage:
+        lines += [
+            "    expected = certs[0].subject",
+            "    previous = None",
+        ]
+    lines += [
+        "    for cert in certs:",
+        "        if not_before < cert.valid_from:",
+        "            errors.append(f'Certificate for {cert.subject} is not yet valid')",
+        "        if not_after > cert.valid_to:",
+        "            errors.append(f'Certificate for {cert.subject} has expired')",
+    ]
+    if policy.revocation is not None:
+        lines += [
+            "        if REVOCATION.is_revoked(cert.serial_number):",
+            "            errors.append(f'Certificate for {cert.subject} has been revoked')",
+        ]
+    if linkage:
+        lines += [
+            "        if cert.subject != expected:",
+            "            errors.append(f'Invalid issuer: {previous.subject} not issued by {cert.subject}')",
+            "        expected = cert.issuer",
+            "        previous = cert",
+        ]
+    if policy.pins is not None:
+        lines += [
+            "    violation = PINS.check(chain, now)",
+            "    if violation:",
+            "        errors.append(violation)",
+        ]
+    if linkage:
+        lines += [
+            "    root = certs[-1]",
+            "    if not root.is_root:",
+            "        errors.append(NOT_ROOT_MESSAGE)",
+        ]
+        if policy.allowed_roots is not None:
+            lines += [
+                "    elif root.serial_number not in ALLOWED_ROOTS and root.subject not in ALLOWED_ROOTS:",
+                "        errors.append(f'Root {root.subject} is not allowed by policy')",
+            ]
+    lines.append("    return not errors, errors")
+    return lines
+
+@lru_cache(maxsize=64)
+def compile_policy(policy):
+    # Generates a validator containing only the checks the policy turns on,
+    # so a disabled check costs nothing rather than a branch per certificate
+    build = _all_errors_source if policy.collect_all_errors else _fail_fast_source
+    source = "\n".join(build(policy)) + "\n"
+    namespace = {
+        "datetime_now": datetime.now,
+        "MAX_LENGTH": policy.max_length,
+        "CLOCK_SKEW": policy.clock_skew,
+        "ALLOWED_ROOTS": policy.allowed_roots,
+        "REVOCATION": policy.revocation,
+        "PINS": policy.pins,
+        "TRUST_BYPASS_MESSAGE": TRUST_BYPASS_MESSAGE,
+        "VALID_MESSAGE": VALID_MESSAGE,
+        "NOT_ROOT_MESSAGE": NOT_ROOT_MESSAGE,
+    }
+    exec(compile(source, "<validation policy>", "exec"), namespace)
+    validate = namespace["validate"]
+    validate.source = source
+    return validate
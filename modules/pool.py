@@ -0,0 +1,124 @@
+import argparse
+import sys
+from .certificate import Certificate
+
+def certificate_key(cert):
+    # Content address: two certificates with the same key are interchangeable
+    return (cert.serial_number, cert.subject, cert.issuer,
+            cert.valid_from, cert.valid_to, cert.is_root)
+
+def certificate_size(cert):
+    # Approximate bytes owned by one Certificate object: fields aren't shared
+    # between separately parsed copies, and bool is a singleton so isn't counted.
+    # Touching cert.__dict__ would allocate one, so the instance size stands in
+    size = sys.getsizeof(cert)
+    for value in (cert.subject, cert.issuer, cert.serial_number, cert.valid_from, cert.valid_to):
+        size += sys.getsizeof(value)
+    return size
+
+def _tuple_size(values):
+    return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+
+class CertificatePool:
+    # Only CA certificates are pooled: they are what chains share, while
+    # leaves are nearly always unique, so pooling them would just keep every
+    # leaf alive. Memory therefore grows with the number of CAs, not chains
+    def __init__(self):
+        self.certificates = {}
+        # Raw from_dict fields -> pooled certificate, so duplicates in a
+        # file skip date parsing as well as the extra object
+        self._parsed = {}
+        self.references = 0
+        self.leaves = 0
+        self.duplicate_bytes = 0
+
+    def __len__(self):
+        return len(self.certificates)
+
+    def __contains__(self, cert):
+        return certificate_key(cert) in self.certificates
+
+    def intern(self, cert):
+        # Returns the pooled certificate equal to cert, adding cert if it's new
+        self.references += 1
+        key = certificate_key(cert)
+        pooled = self.certificates.get(key)
+        if pooled is None:
+            self.certificates[key] = cert
+            return cert
+        if pooled is not cert:
+            self.duplicate_bytes += certificate_size(cert)
+        return pooled
+
+    def intern_chain(self, chain):
+        chain.certificates = chain.certificates[:1] + [self.intern(cert) for cert in chain.certificates[1:]]
+        self.leaves += bool(chain.certificates)
+        return chain
+
+    def from_dict(self, data, leaf=False):
+        if leaf:
+            self.leaves += 1
+            return Certificate.from_dict(data)
+        raw = (data["serial_number"], data["subject"], data["issuer"],
+               data["valid_from"], data["valid_to"], bool(data.get("is_root", False)))
+        pooled = self._parsed.get(raw)
+        if pooled is not None:
+            self.references += 1
+            self.duplicate_bytes += certificate_size(pooled)
+            return pooled
+        pooled = self.intern(Certificate.from_dict(data))
+        self._parsed[raw] = pooled
+        return pooled
+
+    def clear(self):
+        self.certificates.clear()
+        self._parsed.clear()
+        self.references = 0
+        self.leaves = 0
+        self.duplicate_bytes = 0
+
+    def index_bytes(self):
+        # The pool's own overhead: both dicts, their key tuples and the raw
+        # field strings (certificate_key tuples share the certificate's fields)
+        size = sys.getsizeof(self.certificates) + sys.getsizeof(self._parsed)
+        size += sum(sys.getsizeof(key) for key in self.certificates)
+        size += sum(_tuple_size(raw) for raw in self._parsed)
+        return size
+
+    def report(self):
+        unique_bytes = sum(certificate_size(cert) for cert in self.certificates.values())
+        index_bytes = self.index_bytes()
+        saved = self.duplicate_bytes - index_bytes
+        return {
+            "unique": len(self.certificates),
+            "references": self.references,
+            "duplicates": self.references - len(self.certificates),
+            "leaves": self.leaves,
+            "unique_bytes": unique_bytes,
+            "index_bytes": index_bytes,
+            "saved_bytes": saved,
+            "saved_fraction": saved / (unique_bytes + self.duplicate_bytes) if unique_bytes else 0.0,
+        }
+
+def main():
+    from .ingest import CertificateReader
+
+    parser = argparse.ArgumentParser(description="Report certificate duplication in a chain corpus")
+    parser.add_argument("path", help="JSONL/CSV chain file")
+    args = parser.parse_args()
+
+    pool = CertificatePool()
+    chains = sum(1 for _ in CertificateReader(args.path, pool=pool).chains())
+    report = pool.report()
+    print(f"Chains:                   {chains:,}")
+    print(f"Leaf certificates:        {report['leaves']:,} (not pooled)")
+    print(f"CA references:            {report['references']:,}")
+    print(f"Unique CA certificates:   {report['unique']:,}")
+    print(f"Duplicates shared:        {report['duplicates']:,}")
+    print(f"Memory for unique CAs:    {report['unique_bytes'] / 1e6:.1f} MB")
+    print(f"Pool index overhead:      {report['index_bytes'] / 1e6:.1f} MB")
+    print(f"Saved by deduplication:   {report['saved_bytes'] / 1e6:.1f} MB "
+          f"({report['saved_fraction']:.1%})")
+
+if __name__ == "__main__":
+    main()
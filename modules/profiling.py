@@ -0,0 +1,207 @@
+import cProfile
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+# Everything under modules/ is reported by module name (certificate,
+# visualizer, scenarios, quiz, ...); rich, the entry script and the import
+# machinery get their own groups. Time and memory spent in the standard library
+# or built-ins is charged to the nearest group up the stack, so e.g.
+# datetime.now() called from validate() counts as "certificate"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Enough frames to find the owning module of a stdlib allocation; tracemalloc
+# slows down sharply with deeper tracebacks
+TRACEBACK_FRAMES = 6
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 30
+# Collapsed stacks below this many microseconds are dropped
+MIN_STACK_US = 1
+
+def module_group(filename):
+    if filename.startswith("<frozen importlib"):
+        return "import"
+    if not filename or filename.startswith("<") or filename == "~":
+        return "other"
+    path = os.path.abspath(filename)
+    if os.path.dirname(path) == PACKAGE_DIR:
+        return os.path.splitext(os.path.basename(path))[0]
+    if f"{os.sep}rich{os.sep}" in path:
+        return "rich"
+    if os.path.basename(path) == "cert_game.py":
+        return "cert_game"
+    return "other"
+
+def cpu_groups(stats):
+    # func -> group, following the heaviest caller edge for "other" functions
+    entries = stats.stats
+    groups = {}
+
+    def resolve(func):
+        group = groups.get(func)
+        if group is not None:
+            return group
+        group = module_group(func[0])
+        if group == "other":
+            groups[func] = "other"  # cycle guard while walking up
+            callers = entries[func][4] if func in entries else {}
+            if callers:
+                caller = max(callers, key=lambda candidate: callers[candidate][3])
+                group = resolve(caller)
+        groups[func] = group
+        return group
+
+    for func in entries:
+        resolve(func)
+    return groups
+
+def allocation_group(traceback):
+    # Most recent frame first, the first one that belongs to a group
+    for frame in reversed(traceback):
+        group = module_group(frame.filename)
+        if group != "other":
+            return group
+    return "other"
+
+def _frame_name(func):
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins show up as ('~', 0, '<built-in method ...>')
+        return name.strip("<>").replace(";", ",")
+    return f"{os.path.basename(filename)}:{name}"
+
+def collapsed_stacks(stats):
+    # cProfile only records caller->callee pairs, not whole stacks, so each
+    # function's time is split across its call paths in proportion to the
+    # time spent in each caller->callee edge (as gprof does). Good enough to
+    # see where time goes in a flamegraph; exact per-stack times would need
+    # a sampling profiler
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [func for func, entry in entries.items() if not entry[4]]
+
+    totals = {}
+
+    def walk(func, path_time, stack):
+        _, _, self_time, cumulative, _ = entries[func]
+        if cumulative <= 0:
+            return
+        stack.append(_frame_name(func))
+        share = path_time / cumulative
+        key = ";".join(stack)
+        totals[key] = totals.get(key, 0.0) + self_time * share
+        visiting.add(func)
+        for callee, edge_time in callees.get(func, ()):
+            child_time = edge_time * share
+            if callee not in visiting and child_time * 1e6 >= MIN_STACK_US:
+                walk(callee, child_time, stack)
+        visiting.discard(func)
+        stack.pop()
+
+    visiting = set()
+    for root in roots:
+        walk(root, entries[root][3], [])
+    return {stack: total for stack, total in totals.items() if total * 1e6 >= MIN_STACK_US}
+
+class Profiler:
+    # Deterministic CPU profile plus tracemalloc snapshots around a run.
+    # Writes <prefix>.hotspots.txt, <prefix>.collapsed.txt (flamegraph.pl /
+    # speedscope input) and <prefix>.allocations.txt
+    def __init__(self, prefix="profile"):
+        self.prefix = prefix
+        self.profile = cProfile.Profile()
+        self.start_snapshot = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        self.write_reports()
+        return False
+
+    def start(self):
+        tracemalloc.start(TRACEBACK_FRAMES)
+        self.start_snapshot = tracemalloc.take_snapshot()
+        self.started = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.elapsed = time.perf_counter() - self.started
+        self.end_snapshot = tracemalloc.take_snapshot()
+        _, self.peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    def paths(self):
+        return {kind: f"{self.prefix}.{kind}.txt" for kind in ("hotspots", "collapsed", "allocations")}
+
+    def write_reports(self):
+        paths = self.paths()
+        stats = pstats.Stats(self.profile)
+        self._write_hotspots(paths["hotspots"], stats)
+        with open(paths["collapsed"], "w", encoding="utf-8") as output:
+            for stack, seconds in sorted(collapsed_stacks(stats).items()):
+                output.write(f"{stack} {round(seconds * 1e6)}\n")
+        self._write_allocations(paths["allocations"])
+        # stdout may carry JSON results or the rich UI
+        sys.stderr.write("Profile written to " + ", ".join(paths.values()) + "\n")
+        return paths
+
+    def _write_hotspots(self, path, stats):
+        groups = cpu_groups(stats)
+        by_group = {}
+        for func, (_, _, self_time, _, _) in stats.stats.items():
+            group = groups[func]
+            by_group[group] = by_group.get(group, 0.0) + self_time
+
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(f"Wall time: {self.elapsed:.3f}s, profiled CPU time: {stats.total_tt:.3f}s\n")
+            # Both profilers run at once, so allocation-heavy code looks slower than it is
+            output.write("Times include profiling and allocation tracing overhead\n\n")
+            output.write("Own time by module\n")
+            for group, seconds in sorted(by_group.items(), key=lambda item: -item[1]):
+                share = seconds / stats.total_tt if stats.total_tt else 0.0
+                output.write(f"  {group:<14} {seconds:9.4f}s  {share:6.1%}\n")
+            for sort_key, title in (("tottime", "own time"), ("cumulative", "cumulative time")):
+                output.write(f"\nTop {TOP_FUNCTIONS} functions by {title}\n")
+                stats.stream = output
+                stats.sort_stats(sort_key).print_stats(TOP_FUNCTIONS)
+
+    def _write_allocations(self, path):
+        filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+        snapshot = self.end_snapshot.filter_traces(filters)
+        by_group = {}
+        for stat in snapshot.statistics("traceback"):
+            group = allocation_group(stat.traceback)
+            size, count = by_group.get(group, (0, 0))
+            by_group[group] = (size + stat.size, count + stat.count)
+
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(f"Peak traced memory: {self.peak / 1024:.1f} KiB\n\n")
+            output.write("Live allocations at exit by module\n")
+            for group, (size, count) in sorted(by_group.items(), key=lambda item: -item[1][0]):
+                output.write(f"  {group:<14} {size / 1024:10.1f} KiB  {count:8} blocks\n")
+
+            output.write(f"\nTop {TOP_ALLOCATIONS} allocation sites\n")
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                output.write(f"  {stat.size / 1024:10.1f} KiB  {stat.count:8} blocks  "
+                             f"[{module_group(frame.filename)}] {frame.filename}:{frame.lineno}\n")
+
+            output.write(f"\nTop {TOP_ALLOCATIONS} sites by growth during the run\n")
+            for stat in snapshot.compare_to(self.start_snapshot.filter_traces(filters), "lineno")[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                output.write(f"  {stat.size_diff / 1024:+10.1f} KiB  {stat.count_diff:+8} blocks  "
+                             f"[{module_group(frame.filename)}] {frame.filename}:{frame.lineno}\n")
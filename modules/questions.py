@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from typing import List, Dict
+import json
+
+@dataclass(frozen=True)
+class Question:
+    text: str
+    options: Dict[str, str]
+    correct_answer: str
+    explanation: str
+
+    @classmethod
+    def from_dict(cls, data):
+        # Option keys are single letters, stored lowercase like correct_answer,
+        # since answers are graded and counted by letter
+        options = {}
+        for key, text in dict(data["options"]).items():
+            letter = str(key).strip().lower()
+            if len(letter) != 1 or not "a" <= letter <= "z":
+                raise ValueError(f"option {key!r} is not a single letter a-z")
+            if letter in options:
+                raise ValueError(f"option {key!r} is given twice")
+            options[letter] = text
+        correct_answer = str(data["correct_answer"]).strip().lower()
+        if correct_answer not in options:
+            raise ValueError(f"correct answer {data['correct_answer']!r} is not one of the options")
+        return cls(
+            text=data["text"],
+            options=options,
+            correct_answer=correct_answer,
+            explanation=data.get("explanation", "")
+        )
+
+    def to_dict(self):
+        return {
+            "text": self.text,
+            "options": self.options,
+            "correct_answer": self.correct_answer,
+            "explanation": self.explanation
+        }
+
+# Score bands shared by the interactive quiz and bulk grading
+EXCELLENT = "excellent"
+GOOD = "good"
+REVIEW = "review"
+
+def score_band(percentage):
+    if percentage >= 80:
+        return EXCELLENT
+    if percentage >= 60:
+        return GOOD
+    return REVIEW
+
+def load_questions(path) -> List[Question]:
+    # A JSON list of Question.to_dict() objects
+    with open(path, encoding="utf-8") as source:
+        data = json.load(source)
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"{path}: expected a non-empty list of questions")
+    questions = []
+    for number, item in enumerate(data, 1):
+        try:
+            questions.append(Question.from_dict(item))
+        except KeyError as e:
+            raise ValueError(f"{path}: question {number} is missing {e}") from None
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"{path}: question {number}: {e}") from None
+    return questions
+
+def save_questions(path, questions):
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump([question.to_dict() for question in questions], output, indent=2)
+        output.write("\n")
+
+QUESTIONS = (
+    Question(
+        "What is the primary purpose of a Root CA certificate?",
+        {
+            "a": "To encrypt website traffic",
+            "b": "To serve as the trust anchor for the PKI system",
+            "c": "To validate user passwords",
+            "d": "To speed up HTTPS connections"
+        },
+        "b",
+        "A Root CA certificate serves as the trust anchor in a PKI system. It's self-signed and used to issue and validate other certificates."
+    ),
+    Question(
+        "Why are Intermediate CA certificates commonly used?",
+        {
+            "a": "To save money on certificate costs",
+            "b": "To make certificates work faster",
+            "c": "To protect the Root CA by keeping it offline",
+            "d": "To support more encryption algorithms"
+        },
+        "c",
+        "Intermediate CAs protect the Root CA by allowing it to remain safely offline while the Intermediate CA handles day-to-day certificate issuance."
+    ),
+    Question(
+        "What happens when a leaf certificate expires?",
+        {
+            "a": "Nothing, it continues to work",
+            "b": "The private key changes automatically",
+            "c": "Browsers show security warnings",
+            "d": "The certificate repairs itself"
+        },
+        "c",
+        "When a certificate expires, browsers show security warnings because the certificate is no longer valid according to its validity period."
+    ),
+    Question(
+        "What is the risk of using trustServerCertificate=true?",
+        {
+            "a": "It makes connections slower",
+            "b": "It allows man-in-the-middle attacks",
+            "c": "It uses more memory",
+            "d": "It requires more CPU power"
+        },
+        "b",
+        "Using trustServerCertificate=true bypasses certificate chain validation, making it possible for attackers to intercept traffic through man-in-the-middle attacks."
+    ),
+    Question(
+        "What is certificate chain validation?",
+        {
+            "a": "Checking certificate file size",
+            "b": "Verifying the website's IP address",
+            "c": "Validating the path from leaf to root certificate",
+            "d": "Measuring certificate download speed"
+        },
+        "c",
+        "Certificate chain validation involves checking the trust path from a leaf certificate back to a trusted root certificate, ensuring each certificate was issued by its parent."
+    ),
+    Question(
+        "Which component signs an Intermediate CA certificate?",
+        {
+            "a": "The leaf certificate",
+            "b": "Another Intermediate CA",
+            "c": "The Root CA",
+            "d": "The web server"
+        },
+        "c",
+        "Intermediate CA certificates are signed by the Root CA, establishing the chain of trust from the root to the leaf certificates."
+    ),
+    Question(
+        "What is a common cause of certificate chain errors?",
+        {
+            "a": "Using HTTPS instead of HTTP",
+            "b": "Missing intermediate certificates",
+            "c": "Network being too fast",
+            "d": "Having too many certificates"
+        },
+        "b",
+        "Missing intermediate certificates break the chain of trust because browsers can't verify the path from the leaf certificate to a trusted root CA."
+    ),
+    Question(
+        "How can you prevent man-in-the-middle attacks?",
+        {
+            "a": "Use faster internet connections",
+            "b": "Always validate the full certificate chain",
+            "c": "Disable HTTPS entirely",
+            "d": "Use shorter passwords"
+        },
+        "b",
+        "Proper certificate chain validation is crucial for preventing man-in-the-middle attacks by ensuring the authenticity of certificates."
+    )
+)
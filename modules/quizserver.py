@@ -0,0 +1,262 @@
+from collections import deque
+from itertools import count
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from .questions import QUESTIONS, load_questions, score_band
+from .service import LatencyRecorder
+
+# Line protocol: one JSON object per line in each direction, replies in order.
+#   {"op": "start"}                                 -> {"session": 7, "total": 8, "question": {...}}
+#   {"op": "answer", "session": 7, "answer": "b"}   -> {"correct": true, "explanation": "...",
+#                                                       "score": 1, "question": {...} or null,
+#                                                       "result": {...} once the last answer is in}
+#   {"op": "stats"}                                 -> server counters and answer latency
+# Errors come back as {"error": "..."}. Sessions end with their last answer or
+# when the connection that started them closes.
+
+DEFAULT_PORT = 8766
+
+class QuizSession:
+    __slots__ = ("session_id", "index", "score")
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.index = 0
+        self.score = 0
+
+class QuizEngine:
+    def __init__(self, questions=QUESTIONS):
+        # One read-only bank shared by every session; sessions only hold
+        # their position and score
+        self.questions = tuple(questions)
+        self.prompts = tuple({"number": i, "text": question.text, "options": question.options}
+                             for i, question in enumerate(self.questions, 1))
+        self.sessions = {}
+        self._session_ids = count(1)
+        self.started = 0
+        self.completed = 0
+
+    def start(self):
+        session = QuizSession(next(self._session_ids))
+        self.sessions[session.session_id] = session
+        self.started += 1
+        return session
+
+    def end(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def question(self, session):
+        if session.index >= len(self.questions):
+            return None
+        return self.prompts[session.index]
+
+    def answer(self, session_id, answer):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        question = self.questions[session.index]
+        correct = str(answer).lower() == question.correct_answer.lower()
+        if correct:
+            session.score += 1
+        session.index += 1
+        reply = {"correct": correct, "explanation": question.explanation,
+                 "score": session.score, "question": self.question(session)}
+        if session.index == len(self.questions):
+            total = len(self.questions)
+            percentage = session.score / total * 100
+            reply["result"] = {"score": session.score, "total": total,
+                               "percentage": round(percentage, 1), "band": score_band(percentage)}
+            self.completed += 1
+            self.end(session_id)
+        return reply
+
+class QuizServer:
+    def __init__(self, engine):
+        self.engine = engine
+        self.latency = LatencyRecorder()
+        self.connections = 0
+
+    def stats(self):
+        return {
+            "connections": self.connections,
+            "active_sessions": len(self.engine.sessions),
+            "started": self.engine.started,
+            "completed": self.engine.completed,
+            "answer_latency": self.latency.summary(),
+        }
+
+    def handle(self, record, owned):
+        op = record.get("op")
+        if op == "start":
+            session = self.engine.start()
+            owned.add(session.session_id)
+            return {"session": session.session_id, "total": len(self.engine.questions),
+                    "question": self.engine.question(session)}
+        if op == "answer":
+            started = time.perf_counter()
+            session_id = record.get("session")
+            # Session ids are ints; anything else (a list would not even hash) is unknown
+            if type(session_id) is not int or session_id not in owned:
+                return {"error": f"Unknown session: {session_id}"}
+            reply = self.engine.answer(session_id, record.get("answer"))
+            if "result" in reply:
+                owned.discard(session_id)
+            self.latency.record(time.perf_counter() - started)
+            return reply
+        if op == "stats":
+            return {"stats": self.stats()}
+        return {"error": f"Unknown op: {op!r}"}
+
+    async def handle_connection(self, reader, writer):
+        # Each request is answered before the next line is read, so replies
+        # stay in request order without any per-connection bookkeeping
+        owned = set()
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("Record is not an object")
+                    reply = self.handle(record, owned)
+                except (ValueError, TypeError) as e:
+                    # Reply rather than drop the connection and its pipelined requests
+                    reply = {"error": f"Malformed request: {e}"}
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            for session_id in owned:
+                self.engine.end(session_id)
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, questions=QUESTIONS):
+    server = QuizServer(QuizEngine(questions))
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle_connection, path=unix_path)
+        print(f"Quiz server listening on {unix_path}")
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port)
+        print(f"Quiz server listening on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+async def open_connection(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+class QuizClient:
+    # Many learners share one connection: requests are pipelined and replies,
+    # which arrive in order, are matched to a FIFO of waiting futures
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.waiting = deque()
+        self.receiver = asyncio.create_task(self._receive())
+
+    async def _receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            self.waiting.popleft().set_result(json.loads(line))
+        for future in self.waiting:
+            future.set_exception(ConnectionError("Connection closed"))
+
+    async def request(self, record):
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.append(future)
+        self.writer.write(json.dumps(record).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.receiver.cancel()
+
+async def load_test(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None,
+                    learners=5000, connections=100, think_time=0.0, seed=0):
+    # Runs `learners` concurrent sessions spread over `connections` sockets;
+    # each learner answers every question at random, pausing think_time
+    # seconds (on average) between answers
+    rng = random.Random(seed)
+    latency = LatencyRecorder(size=learners * 16)
+    results = []
+
+    async def learner(client):
+        reply = await client.request({"op": "start"})
+        session_id, question = reply["session"], reply["question"]
+        while question is not None:
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+            sent = time.perf_counter()
+            reply = await client.request({"op": "answer", "session": session_id,
+                                          "answer": rng.choice(list(question["options"]))})
+            latency.record(time.perf_counter() - sent)
+            question = reply["question"]
+        results.append(reply["result"])
+
+    clients = [QuizClient(*await open_connection(host, port, unix_path)) for _ in range(connections)]
+    started = time.perf_counter()
+    await asyncio.gather(*(learner(clients[i % connections]) for i in range(learners)))
+    elapsed = time.perf_counter() - started
+    server_stats = (await clients[0].request({"op": "stats"}))["stats"]
+    for client in clients:
+        await client.close()
+
+    return {
+        "learners": len(results),
+        "answers": latency.count,
+        "seconds": elapsed,
+        "answers_per_second": latency.count / elapsed if elapsed > 0 else 0.0,
+        "client_latency": latency.summary(),
+        "server": server_stats,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-learner quiz server and load generator")
+    parser.add_argument("mode", choices=["serve", "bench"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="Use a Unix socket instead of TCP")
+    parser.add_argument("--questions", metavar="PATH", help="JSON question bank (default: built-in quiz)")
+    parser.add_argument("--learners", type=int, default=5000)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--think-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        try:
+            questions = load_questions(args.questions) if args.questions else QUESTIONS
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+        try:
+            asyncio.run(serve(args.host, args.port, args.unix, questions))
+        except KeyboardInterrupt:
+            pass
+    else:
+        results = asyncio.run(load_test(args.host, args.port, args.unix, args.learners,
+                                        args.connections, args.think_ms / 1000))
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+from bisect import bisect_left
+import sys
+import string
+
+try:
+    import numpy as np
+except ImportError:  # numpy is the optional 'batch' extra
+    np = None
+
+MASK = (1 << 64) - 1
+HEX_DIGITS = frozenset(string.hexdigits)
+BLOOM_BITS_PER_ENTRY = 10
+BLOOM_HASHES = 7
+# Lookups start from a table of up to 2**BUCKET_BITS positions (fewer for short lists)
+BUCKET_BITS = 16
+# Recent is_revoked answers kept by serial. Chains share their CA certificates,
+# so most lookups repeat; the cache is simply emptied when full
+RECENT_ENTRIES = 4096
+
+if np is not None:
+    # Columns of the hex digits and dashes in a canonical UUID string
+    DASH_COLUMNS = np.array([8, 13, 18, 23])
+    HEX_COLUMNS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+    HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+    for digit in b"0123456789":
+        HEX_VALUES[digit] = digit - ord("0")
+    for digit in b"abcdef":
+        HEX_VALUES[digit] = HEX_VALUES[digit - 32] = digit - ord("a") + 10
+
+def _fmix(x):
+    # MurmurHash3 finaliser on 64-bit ints; mirrors _fmix_array bit for bit
+    x ^= x >> 33
+    x = (x * 0xff51afd7ed558ccd) & MASK
+    x ^= x >> 33
+    x = (x * 0xc4ceb9fe1a85ec53) & MASK
+    x ^= x >> 33
+    return x
+
+def _fmix_array(x):
+    x = x ^ (x >> np.uint64(33))
+    x = x * np.uint64(0xff51afd7ed558ccd)
+    x = x ^ (x >> np.uint64(33))
+    x = x * np.uint64(0xc4ceb9fe1a85ec53)
+    return x ^ (x >> np.uint64(33))
+
+def split_serial(serial_number):
+    # (high, low) 64-bit halves for UUID-formatted serials, None otherwise
+    if (len(serial_number) != 36 or serial_number[8] != "-" or serial_number[13] != "-"
+            or serial_number[18] != "-" or serial_number[23] != "-"):
+        return None
+    digits = serial_number.replace("-", "")
+    if len(digits) != 32 or not HEX_DIGITS.issuperset(digits):
+        return None
+    value = int(digits, 16)
+    return value >> 64, value & MASK
+
+def _decode_uniform(data):
+    # Fast path for files that are nothing but UUIDs, one per '\n'-terminated line
+    if data and not data.endswith(b"\n"):
+        data += b"\n"
+    if not data or len(data) % 37:
+        return None
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, 37)
+    if not ((rows[:, 36] == ord("\n")).all() and (rows[:, DASH_COLUMNS] == ord("-")).all()):
+        return None
+    try:
+        blob = bytes.fromhex(data.translate(None, b"-\n").decode("ascii"))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if len(blob) != 16 * len(rows):
+        return None
+    return np.frombuffer(blob, dtype=">u8").reshape(-1, 2).astype(np.uint64)
+
+def _decode_mixed(lines):
+    candidates = [line for line in lines if len(line) == 36]
+    others = {line.decode("utf-8") for line in lines if len(line) != 36}
+    halves = _decode_uniform(b"\n".join(candidates))
+    if halves is not None:
+        return halves, others
+
+    rows = np.frombuffer(b"".join(candidates), dtype=np.uint8).reshape(-1, 36)
+    nibbles = HEX_VALUES[rows[:, HEX_COLUMNS]]
+    ok = (rows[:, DASH_COLUMNS] == ord("-")).all(axis=1) & (nibbles < 16).all(axis=1)
+    for i in np.flatnonzero(~ok):
+        others.add(candidates[i].decode("utf-8"))
+    nibbles = nibbles[ok]
+    packed = np.ascontiguousarray(nibbles[:, 0::2] * 16 + nibbles[:, 1::2])
+    return packed.view(">u8").astype(np.uint64), others
+
+class BloomFilter:
+    def __init__(self, bits, size, hashes=BLOOM_HASHES):
+        self.bits = bits
+        self.size = size
+        self.hashes = hashes
+
+    @classmethod
+    def build(cls, high, low, bits_per_entry=BLOOM_BITS_PER_ENTRY, hashes=BLOOM_HASHES):
+        # Power-of-two size so bit positions are a mask rather than a modulo
+        size = 1 << max(6, (len(high) * bits_per_entry - 1).bit_length())
+        mask = np.uint64(size - 1)
+        first = _fmix_array(high)
+        step = _fmix_array(low ^ first) | np.uint64(1)
+        marks = np.zeros(size, dtype=bool)
+        position = first
+        for _ in range(hashes):
+            marks[position & mask] = True
+            position = position + step
+        return cls(np.packbits(marks, bitorder="little").tobytes(), size, hashes)
+
+    def might_contain(self, high, low):
+        first = _fmix(high)
+        step = _fmix(low ^ first) | 1
+        bits = self.bits
+        mask = self.size - 1
+        position = first
+        for _ in range(self.hashes):
+            bit = position & mask
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+            position = (position + step) & MASK
+        return True
+
+class RevocationList:
+    def __init__(self, serials=(), bloom=False):
+        high, low, others = [], [], set()
+        for serial in serials:
+            parts = split_serial(serial)
+            if parts is None:
+                others.add(serial)
+            else:
+                high.append(parts[0])
+                low.append(parts[1])
+        self._build(high, low, others, bloom)
+
+    @classmethod
+    def load(cls, path, bloom=False):
+        # One serial per line. With numpy, UUID lines are decoded in bulk rather
+        # than one uuid.UUID() at a time, which keeps multi-million entry lists fast
+        with open(path, "rb") as source:
+            data = source.read()
+        if np is None:
+            return cls((line.decode("utf-8") for line in data.split()), bloom)
+
+        halves = _decode_uniform(data)
+        if halves is not None:
+            others = set()
+        else:
+            halves, others = _decode_mixed(data.split())
+
+        revocations = cls.__new__(cls)
+        revocations._build(halves[:, 0], halves[:, 1], others, bloom)
+        return revocations
+
+    def _build(self, high, low, others, bloom):
+        self.others = others
+        self.bloom = None
+        self._recent = {}
+        if np is None:
+            self.serials = set(zip(high, low))
+            self.count = len(self.serials) + len(others)
+            return
+
+        # Sorted by the top bits of the high half only, which one plain sort
+        # of (top bits | index) keys gives without an argsort. Every high in a
+        # run of equal top bits lies within that run's value range, so binary
+        # search by value still works; lookups scan the (practically always
+        # empty or single) run for the exact halves
+        high = np.asarray(high, dtype=np.uint64)
+        low = np.asarray(low, dtype=np.uint64)
+        self.shift = max(1, (len(high) - 1).bit_length())
+        index_mask = np.uint64((1 << self.shift) - 1)
+        keys = (high & ~index_mask) | np.arange(len(high), dtype=np.uint64)
+        keys.sort()
+        order = (keys & index_mask).astype(np.intp)
+        self.high = high[order]
+        self.low = low[order]
+        # Scalar lookups bisect plain-int views of the arrays, as a numpy call
+        # per lookup costs more than the whole search, starting from the
+        # bucket of positions that share the high half's top bits
+        bucket_bits = min(BUCKET_BITS, self.shift)
+        self._bucket_shift = 64 - bucket_bits
+        starts = self.high.searchsorted(np.arange(1 << bucket_bits, dtype=np.uint64) << np.uint64(self._bucket_shift))
+        self._buckets = memoryview(np.append(starts, len(self.high)).astype(np.int64))
+        self._high_view = memoryview(self.high)
+        self._low_view = memoryview(self.low)
+        self.serials = None
+        self.count = len(self.high) + len(others)
+        if bloom and len(self.high):
+            self.bloom = BloomFilter.build(self.high, self.low)
+
+    def __len__(self):
+        return self.count
+
+    def _contains_parts(self, high, low):
+        if self.serials is not None:
+            return (high, low) in self.serials
+        if self.bloom is not None and not self.bloom.might_contain(high, low):
+            return False
+        highs = self._high_view
+        bucket = high >> self._bucket_shift
+        end = self._buckets[bucket + 1]
+        first = high >> self.shift << self.shift
+        i = bisect_left(highs, first, self._buckets[bucket], end)
+        last = first | ((1 << self.shift) - 1)
+        while i < end and highs[i] <= last:
+            if highs[i] == high and self._low_view[i] == low:
+                return True
+            i += 1
+        return False
+
+    def is_revoked(self, serial_number):
+        revoked = self._recent.get(serial_number)
+        if revoked is None:
+            parts = split_serial(serial_number)
+            revoked = serial_number in self.others if parts is None else self._contains_parts(*parts)
+            if len(self._recent) >= RECENT_ENTRIES:
+                self._recent.clear()
+            self._recent[serial_number] = revoked
+        return revoked
+
+    def __contains__(self, serial_number):
+        return self.is_revoked(serial_number)
+
+    def revoked_mask(self, serial_numbers):
+        # Vectorised membership test for batch validation paths
+        if np is None or self.serials is not None:
+            return [self.is_revoked(serial) for serial in serial_numbers]
+        mask = np.zeros(len(serial_numbers), dtype=bool)
+        positions, high, low = [], [], []
+        for i, serial in enumerate(serial_numbers):
+            parts = split_serial(serial)
+            if parts is None:
+                mask[i] = serial in self.others
+            else:
+                positions.append(i)
+                high.append(parts[0])
+                low.append(parts[1])
+        if positions and len(self.high):
+            high = np.array(high, dtype=np.uint64)
+            index_mask = np.uint64((1 << self.shift) - 1)
+            starts = self.high.searchsorted(high & ~index_mask, "left")
+            ends = self.high.searchsorted(high | index_mask, "right")
+            for j in np.flatnonzero(ends > starts):
+                run = slice(starts[j], ends[j])
+                mask[positions[j]] = bool(((self.high[run] == high[j]) & (self.low[run] == np.uint64(low[j]))).any())
+        return mask
+
+    def memory_bytes(self):
+        size = sys.getsizeof(self.others) + sum(sys.getsizeof(serial) for serial in self.others)
+        if self.serials is not None:
+            size += sys.getsizeof(self.serials) + sum(
+                sys.getsizeof(pair) + sys.getsizeof(pair[0]) + sys.getsizeof(pair[1]) for pair in self.serials)
+        else:
+            size += self.high.nbytes + self.low.nbytes + self._buckets.nbytes
+        if self.bloom is not None:
+            size += len(self.bloom.bits)
+        return size
+
+if __name__ == "__main__":
+    import time
+    started = time.perf_counter()
+    revocations = RevocationList.load(sys.argv[1], bloom="--bloom" in sys.argv)
+    elapsed = time.perf_counter() - started
+    print(f"Loaded {len(revocations):,} revoked serials in {elapsed:.2f}s")
+    print(f"Memory: {revocations.memory_bytes() / 1e6:.1f} MB "
+          f"({revocations.memory_bytes() / max(1, len(revocations)):.1f} bytes/serial)")
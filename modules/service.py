@@ -0,0 +1,258 @@
+from collections import deque
+import argparse
+import asyncio
+import json
+import os
+import time
+from .ingest import parse_chain_record
+from .generator import HierarchyGenerator, UNTRUSTED
+
+# Line protocol: one JSON object per line in each direction.
+#   request:  {"id": 1, "certificates": [...], "trust_server_certificate": false}
+#   response: {"id": 1, "valid": true, "message": "Valid certificate chain"}
+# {"stats": true} returns the server's counters and latency percentiles.
+# Responses on a connection come back in request order.
+
+DEFAULT_PORT = 8765
+LATENCY_SAMPLES = 100000
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class LatencyRecorder:
+    def __init__(self, size=LATENCY_SAMPLES):
+        # Most recent samples only, so percentiles follow current load
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "p50_ms": percentile(self.samples, 0.50) * 1000,
+            "p99_ms": percentile(self.samples, 0.99) * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+        }
+
+class ValidationService:
+    def __init__(self, max_batch=256, max_delay=0.002, queue_size=10000):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # Bounded: when full, connection readers wait, which pushes back on clients
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.latency = LatencyRecorder()
+        self.batches = 0
+        self.batched_requests = 0
+        self.rejected = 0
+
+    async def submit(self, record):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future, time.perf_counter()))
+        return future
+
+    async def run_batcher(self):
+        while True:
+            batch = [await self.queue.get()]
+            # Coalesce whatever arrives within max_delay, up to max_batch
+            deadline = time.perf_counter() + self.max_delay
+            while len(batch) < self.max_batch:
+                if self.queue.empty():
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+            self.process(batch)
+
+    def process(self, batch):
+        self.batches += 1
+        self.batched_requests += len(batch)
+        finished = time.perf_counter()
+        for record, future, enqueued in batch:
+            try:
+                chain, trust_flag = parse_chain_record(record)
+                result, message = chain.validate(trust_flag)
+            except (ValueError, KeyError, TypeError) as e:
+                self.rejected += 1
+                result, message = False, f"Malformed record: {e}"
+            if not future.cancelled():
+                future.set_result({"id": record.get("id"), "valid": result, "message": message})
+            finished = time.perf_counter()
+            self.latency.record(finished - enqueued)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.batched_requests,
+            "mean_batch": self.batched_requests / self.batches if self.batches else 0.0,
+            "rejected": self.rejected,
+            "queued": self.queue.qsize(),
+            "latency": self.latency.summary(),
+        }
+
+    async def handle_connection(self, reader, writer):
+        # Responses are written by a separate task in request order, so a client
+        # can pipeline many requests on one connection
+        pending = asyncio.Queue(maxsize=self.max_batch * 4)
+
+        async def write_responses():
+            while True:
+                future = await pending.get()
+                if future is None:
+                    break
+                writer.write(json.dumps(await future).encode("utf-8") + b"\n")
+                if pending.empty():
+                    await writer.drain()
+
+        writer_task = asyncio.create_task(write_responses())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("Record is not an object")
+                except ValueError as e:
+                    record = None
+                    response = {"id": None, "valid": False, "message": f"Malformed record: {e}"}
+
+                if record is not None and not record.get("stats"):
+                    future = await self.submit(record)
+                else:
+                    if record is not None:
+                        response = {"id": record.get("id"), "stats": self.stats()}
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_result(response)
+                await pending.put(future)
+        except ConnectionError:
+            pass
+        finally:
+            await pending.put(None)
+            try:
+                await writer_task
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, **options):
+    service = ValidationService(**options)
+    batcher = asyncio.create_task(service.run_batcher())
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle_connection, path=unix_path)
+        print(f"Validation service listening on {unix_path}")
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        print(f"Validation service listening on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher.cancel()
+
+async def open_connection(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+async def load_test(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None,
+                    connections=50, requests=20000, pipeline=16, seed=0):
+    # Each connection keeps up to `pipeline` requests in flight
+    generator = HierarchyGenerator(seed=seed, fan_out=4, depth=1, leaves=min(requests, 2000),
+                                   expired_fraction=0.05, broken_fraction=0.05, untrusted_fraction=0.05)
+    payloads = []
+    for kind, chain in generator.chains():
+        payloads.append({"certificates": [cert.to_dict() for cert in chain.certificates],
+                         "trust_server_certificate": kind == UNTRUSTED})
+
+    latency = LatencyRecorder(size=requests)
+    per_connection = [requests // connections + (1 if i < requests % connections else 0)
+                      for i in range(connections)]
+
+    async def client(count, offset):
+        reader, writer = await open_connection(host, port, unix_path)
+        sent_at = deque()
+        in_flight = asyncio.Semaphore(pipeline)
+
+        async def send():
+            for i in range(count):
+                await in_flight.acquire()
+                record = dict(payloads[(offset + i) % len(payloads)], id=offset + i)
+                sent_at.append(time.perf_counter())
+                writer.write(json.dumps(record).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        sender = asyncio.create_task(send())
+        for _ in range(count):
+            line = await reader.readline()
+            if not line:
+                break
+            latency.record(time.perf_counter() - sent_at.popleft())
+            in_flight.release()
+        await sender
+        writer.close()
+        await writer.wait_closed()
+
+    started = time.perf_counter()
+    offsets = [sum(per_connection[:i]) for i in range(connections)]
+    await asyncio.gather(*(client(count, offset) for count, offset in zip(per_connection, offsets)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await open_connection(host, port, unix_path)
+    writer.write(b'{"stats": true}\n')
+    await writer.drain()
+    server_stats = json.loads(await reader.readline())["stats"]
+    writer.close()
+    await writer.wait_closed()
+
+    return {
+        "requests": latency.count,
+        "seconds": elapsed,
+        "requests_per_second": latency.count / elapsed if elapsed > 0 else 0.0,
+        "client_latency": latency.summary(),
+        "server": server_stats,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Chain validation service and load generator")
+    parser.add_argument("mode", choices=["serve", "bench"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="Use a Unix socket instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--pipeline", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+        try:
+            asyncio.run(serve(args.host, args.port, args.unix, max_batch=args.max_batch,
+                              max_delay=args.max_delay_ms / 1000, queue_size=args.queue_size))
+        except KeyboardInterrupt:
+            pass
+    else:
+        results = asyncio.run(load_test(args.host, args.port, args.unix, args.connections,
+                                        args.requests, args.pipeline))
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
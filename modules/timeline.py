@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+import argparse
+
+def validity_interval(chain, trust_server_certificate=False, revocation=None):
+    # validate() only depends on the clock through the certificate dates, so a
+    # chain is valid exactly while every certificate is: from the latest
+    # valid_from to the earliest valid_to (inclusive). Returns None if there is
+    # no such time, or if the chain fails for reasons the clock can't change.
+    if not chain.certificates:
+        return None
+    start = max(cert.valid_from for cert in chain.certificates)
+    end = min(cert.valid_to for cert in chain.certificates)
+    if start > end:
+        return None
+    result, _ = chain.validate(trust_server_certificate, revocation, at=start)
+    return (start, end) if result else None
+
+def sweep(intervals, start, end, step=timedelta(days=1)):
+    # Counts the intervals containing each of start, start + step, ... <= end,
+    # with a difference array instead of revalidating at every point
+    if step <= timedelta(0):
+        raise ValueError("step must be positive")
+    points = (end - start) // step + 1
+    if points <= 0:
+        return []
+    deltas = [0] * (points + 1)
+    for interval in intervals:
+        if interval is None:
+            continue
+        valid_from, valid_to = interval
+        if valid_to < start or valid_from > end:
+            continue
+        # First sample point at or after valid_from, last one at or before valid_to
+        first = 0 if valid_from <= start else -((start - valid_from) // step)
+        last = min(points - 1, (valid_to - start) // step)
+        if first <= last:
+            deltas[first] += 1
+            deltas[last + 1] -= 1
+
+    counts = []
+    running = 0
+    for i in range(points):
+        running += deltas[i]
+        counts.append((start + i * step, running))
+    return counts
+
+def sweep_chains(chains, start, end, step=timedelta(days=1), trust_server_certificate=False, revocation=None):
+    intervals = [validity_interval(chain, trust_server_certificate, revocation) for chain in chains]
+    return intervals, sweep(intervals, start, end, step)
+
+def breaking_points(intervals, start, end):
+    # When each chain stops being valid inside [start, end], earliest first
+    breaks = [(interval[1], i) for i, interval in enumerate(intervals)
+              if interval is not None and interval[0] <= start and start <= interval[1] < end]
+    return sorted(breaks)
+
+def main():
+    from .generator import HierarchyGenerator, UNTRUSTED
+    from .ingest import CertificateReader
+
+    parser = argparse.ArgumentParser(description="Day-by-day count of valid chains over a period")
+    parser.add_argument("path", nargs="?", help="JSONL/CSV chain file (default: a generated corpus)")
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--step-days", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.path:
+        records = ((chain, flag) for _, chain, flag in CertificateReader(args.path).chains())
+    else:
+        generator = HierarchyGenerator(seed=0, fan_out=4, depth=2, leaves=10000, expired_fraction=0.05)
+        records = ((chain, kind == UNTRUSTED) for kind, chain in generator.chains())
+
+    intervals = [validity_interval(chain, flag) for chain, flag in records]
+    start = datetime.now()
+    for day, count in sweep(intervals, start, start + timedelta(days=args.days), timedelta(days=args.step_days)):
+        print(f"{day:%Y-%m-%d}\t{count}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from datetime import datetime
+from .certificate import CertificateChain
+
+class TrustStore:
+    def __init__(self, certificates=()):
+        self.by_subject = {}
+        self.by_serial = {}
+        for cert in certificates:
+            self.add(cert)
+
+    def __len__(self):
+        return len(self.by_serial)
+
+    def __contains__(self, cert):
+        return cert.serial_number in self.by_serial
+
+    def add(self, cert):
+        if cert.serial_number in self.by_serial:
+            return
+        self.by_serial[cert.serial_number] = cert
+        self.by_subject.setdefault(cert.subject, []).append(cert)
+
+    def add_all(self, certificates):
+        for cert in certificates:
+            self.add(cert)
+
+    def remove(self, cert):
+        stored = self.by_serial.pop(cert.serial_number, None)
+        if stored is None:
+            return False
+        candidates = self.by_subject[stored.subject]
+        candidates.remove(stored)
+        if not candidates:
+            del self.by_subject[stored.subject]
+        return True
+
+    def get(self, serial_number):
+        return self.by_serial.get(serial_number)
+
+    def find_issuers(self, cert):
+        return self.by_subject.get(cert.issuer, [])
+
+    def build_chain(self, leaf, pool=(), max_length=16):
+        return build_chain(leaf, self.find_issuers, pool, max_length)
+
+def build_chain(leaf, find_issuers, pool=(), max_length=16):
+    # Certificates sent alongside the leaf take precedence over the store
+    extra = TrustStore(pool) if pool else None
+    now = datetime.now()
+
+    chain = CertificateChain()
+    chain.add_certificate(leaf)
+    seen = {leaf.serial_number}
+    current = leaf
+
+    while not current.is_root and len(chain.certificates) < max_length:
+        # A self-issued certificate that isn't a root can't lead anywhere
+        if current.issuer == current.subject:
+            break
+
+        candidates = []
+        if extra is not None:
+            candidates.extend(extra.find_issuers(current))
+        candidates.extend(find_issuers(current))
+
+        issuer = _pick_issuer(candidates, seen, now)
+        if issuer is None:
+            # Incomplete chain - validate() reports it as not ending in a root
+            break
+
+        chain.add_certificate(issuer)
+        seen.add(issuer.serial_number)
+        current = issuer
+
+    return chain
+
+def _pick_issuer(candidates, seen, now):
+    fallback = None
+    for cert in candidates:
+        if cert.serial_number in seen:
+            continue
+        # Prefer an issuer that is currently within its validity period
+        if cert.valid_from <= now <= cert.valid_to:
+            return cert
+        if fallback is None:
+            fallback = cert
+    return fallback
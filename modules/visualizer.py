@@ -1,71 +1,116 @@
+from functools import lru_cache
 from rich.console import Console
 from rich.text import Text
 from datetime import datetime
 
 console = Console()
 
+# Chains longer than this are drawn with the middle collapsed
+MAX_DRAWN_CERTIFICATES = 12
+
+MITM_HEADER = [
+    ("\n⚠️  SECURITY RISK: Man-in-the-Middle Attack Scenario", "bold red"),
+    ("When trustServerCertificate=true, traffic can be intercepted:", "red"),
+    ("\nClient", None),
+    ("┌" + "─" * 40 + "┐", None),
+    ("│ Secure Connection Expected              │", None),
+    ("└" + "─" * 40 + "┘", None),
+    ("         │", None),
+    ("         ▼", None),
+    ("Malicious Interceptor", "bold red"),
+    ("┌" + "─" * 40 + "┐", None),
+    ("│ ⚠️  Traffic Being Intercepted           │", None),
+    ("└" + "─" * 40 + "┘", None),
+    ("         │", None),
+    ("         ▼", None),
+]
+
+MITM_FOOTER = [
+    ("\nSecurity Impact:", "bold red"),
+    ("• Attacker can read all traffic", None),
+    ("• Sensitive data can be stolen", None),
+    ("• Actions can be modified", None),
+    ("\nPrevention:", "bold yellow"),
+    ("• Never use trustServerCertificate=true in production", None),
+    ("• Always validate the full certificate chain", None),
+    ("• Keep root CA certificates up to date", None),
+]
+
+def _styled(lines, markup):
+    if not markup:
+        return [text for text, _ in lines]
+    return [f"[{style}]{text}[/{style}]" if style else text for text, style in lines]
+
+@lru_cache(maxsize=4096)
+def _render_box(serial_number, subject, issuer, valid_from, valid_to, cert_type, first):
+    # Keyed on the serial plus every displayed field, so a reused serial with
+    # different contents never serves a stale box
+    return (
+        f"\n{'' if first else '└── '}{subject}\n"
+        + "┌" + "─" * 40 + "┐\n"
+        + f"│ Subject: {subject:<30} │\n"
+        + f"│ Issuer: {issuer:<31} │\n"
+        + f"│ Valid From: {valid_from.strftime('%Y-%m-%d'):<27} │\n"
+        + f"│ Valid To: {valid_to.strftime('%Y-%m-%d'):<29} │\n"
+        + f"│ Type: {cert_type:<33} │\n"
+        + "└" + "─" * 40 + "┘"
+    )
+
 class CertificateVisualizer:
     @staticmethod
-    def draw_chain(chain, show_mitm=False):
+    def render_chain(chain, show_mitm=False, markup=True, max_certificates=MAX_DRAWN_CERTIFICATES):
+        # Builds the whole drawing as one string so it can be written in one call
         if not chain or not chain.certificates:
-            console.print("\n[yellow]Warning: No certificates to display[/yellow]")
-            return
+            return _styled([("\nWarning: No certificates to display", "yellow")], markup)[0]
 
-        console.print("\n[bold cyan]Certificate Chain Visualization:[/bold cyan]")
+        lines = _styled([("\nCertificate Chain Visualization:", "bold cyan")], markup)
 
         # Display certificates in correct order (leaf at bottom)
         certs = list(reversed(chain.certificates))
+        last = len(certs) - 1
 
         if show_mitm:
-            console.print("\n[bold red]⚠️  SECURITY RISK: Man-in-the-Middle Attack Scenario[/bold red]")
-            console.print("[red]When trustServerCertificate=true, traffic can be intercepted:[/red]")
-
-            # Draw the client
-            console.print("\nClient")
-            console.print("┌" + "─" * 40 + "┐")
-            console.print("│ Secure Connection Expected              │")
-            console.print("└" + "─" * 40 + "┘")
-            console.print("         │")
-            console.print("         ▼")
-
-            # Draw the attacker
-            console.print("[bold red]Malicious Interceptor[/bold red]")
-            console.print("┌" + "─" * 40 + "┐")
-            console.print("│ ⚠️  Traffic Being Intercepted           │")
-            console.print("└" + "─" * 40 + "┘")
-            console.print("         │")
-            console.print("         ▼")
-
-        # Draw the certificate chain
+            lines.extend(_styled(MITM_HEADER, markup))
+
+        # Keep both ends of very long chains and summarise the middle
+        hidden = range(0)
+        if max_certificates and len(certs) > max_certificates:
+            head = max_certificates // 2
+            hidden = range(head, len(certs) - (max_certificates - head))
+
         for i, cert in enumerate(certs):
+            if i in hidden:
+                if i == hidden.start:
+                    lines.append(f"\n         ⋮  … {len(hidden)} intermediates …")
+                    lines.append("         │")
+                    lines.append("         ▲")
+                continue
             try:
-                # Create certificate box
-                console.print(f"\n{'└── ' if i > 0 else ''}{cert.subject}")
-                console.print("┌" + "─" * 40 + "┐")
-                console.print(f"│ Subject: {cert.subject:<30} │")
-                console.print(f"│ Issuer: {cert.issuer:<31} │")
-                console.print(f"│ Valid From: {cert.valid_from.strftime('%Y-%m-%d'):<27} │")
-                console.print(f"│ Valid To: {cert.valid_to.strftime('%Y-%m-%d'):<29} │")
-                cert_type = 'Root' if cert.is_root else ('Intermediate' if i > 0 and i < len(certs)-1 else 'Leaf')
-                console.print(f"│ Type: {cert_type:<33} │")
-                console.print("└" + "─" * 40 + "┘")
+                cert_type = 'Root' if cert.is_root else ('Intermediate' if i > 0 and i < last else 'Leaf')
+                lines.append(_render_box(cert.serial_number, cert.subject, cert.issuer,
+                                         cert.valid_from, cert.valid_to, cert_type, i == 0))
 
                 # Only draw arrow if not the last certificate
-                if i < len(certs) - 1:
-                    console.print("         │")
-                    console.print("         ▲")
+                if i < last:
+                    lines.append("         │")
+                    lines.append("         ▲")
             except Exception as e:
-                console.print(f"[red]Error displaying certificate {i+1}: {str(e)}[/red]")
+                lines.extend(_styled([(f"Error displaying certificate {i+1}: {str(e)}", "red")], markup))
 
         if show_mitm:
-            console.print("\n[bold red]Security Impact:[/bold red]")
-            console.print("• Attacker can read all traffic")
-            console.print("• Sensitive data can be stolen")
-            console.print("• Actions can be modified")
-            console.print("\n[bold yellow]Prevention:[/bold yellow]")
-            console.print("• Never use trustServerCertificate=true in production")
-            console.print("• Always validate the full certificate chain")
-            console.print("• Keep root CA certificates up to date")
+            lines.extend(_styled(MITM_FOOTER, markup))
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def render_text(chain, show_mitm=False, max_certificates=MAX_DRAWN_CERTIFICATES):
+        # Plain text without markup, e.g. for writing many chains to a log
+        return CertificateVisualizer.render_chain(chain, show_mitm, markup=False,
+                                                  max_certificates=max_certificates)
+
+    @staticmethod
+    def draw_chain(chain, show_mitm=False, max_certificates=MAX_DRAWN_CERTIFICATES):
+        console.print(CertificateVisualizer.render_chain(chain, show_mitm, max_certificates=max_certificates))
 
     @staticmethod
     def show_validation_result(result, message):
@@ -74,4 +119,4 @@ class CertificateVisualizer:
             console.print(f"[green]{message}[/green]")
         else:
             console.print("\n[bold red]✗ Chain Validation Failed[/bold red]")
-            console.print(f"[red]{message}[/red]")
\ No newline at end of file
+            console.print(f"[red]{message}[/red]")
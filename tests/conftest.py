@@ -0,0 +1,41 @@
+import random
+from datetime import timedelta
+import pytest
+from modules.certificate import Certificate, CertificateChain
+from modules.generator import HierarchyGenerator
+from modules.pinning import PinStore
+from modules.revocation import RevocationList
+from modules.scenarios import Scenarios
+
+@pytest.fixture(scope="module")
+def mixed_corpus():
+    # (chains, at, revocation, pins): generated chains covering every outcome,
+    # the scenario chains and some empty ones, checked as of `at`
+    generator = HierarchyGenerator(seed=3, roots=2, fan_out=2, depth=2, leaves=600, expired_fraction=0.1,
+                                   broken_fraction=0.1, untrusted_fraction=0.1)
+    at = generator.base_time
+    chains = [chain for _, chain in generator.chains()]
+    future = Certificate("future.example.com", chains[0].certificates[0].issuer, at + timedelta(days=1),
+                         at + timedelta(days=90), False, "future")
+    not_yet_valid = CertificateChain()
+    for cert in [future] + chains[0].certificates[1:]:
+        not_yet_valid.add_certificate(cert)
+    chains += [not_yet_valid, Scenarios.get_basic_chain(), Scenarios.get_mitm_attack_chain(),
+               Scenarios.get_broken_chain()]
+
+    rng = random.Random(3)
+    certs = [cert for chain in chains for cert in chain.certificates]
+    leaves = [chain.certificates[0] for chain in chains]
+    revocation = RevocationList(cert.serial_number for cert in rng.sample(leaves, 40))
+    # Pin some leaves to their own root and others to a CA they don't chain to
+    pins = PinStore()
+    for chain in rng.sample(chains, 60):
+        pinned = rng.choice(certs) if rng.random() < 0.5 else chain.certificates[-1]
+        pins.add(chain.certificates[0].subject, [pinned.serial_number])
+
+    chains += [CertificateChain() for _ in range(3)]
+    rng.shuffle(chains)
+    return chains, at, revocation, pins
+
+def option_sets(revocation, pins):
+    return ({}, {"revocation": revocation}, {"pins": pins}, {"revocation": revocation, "pins": pins})
@@ -0,0 +1,12 @@
+from conftest import option_sets
+from modules.batch import BatchValidator, VALID_CODES
+
+def test_batch_matches_validate(mixed_corpus):
+    chains, at, revocation, pins = mixed_corpus
+    for trust in (False, True):
+        for options in option_sets(revocation, pins):
+            expected = [chain.validate(trust, at=at, **options) for chain in chains]
+            codes, messages = BatchValidator.validate(chains, trust, at, **options)
+            assert [(code in VALID_CODES, message) for code, message in zip(codes.tolist(), messages)] \
+                == expected
+            assert len(set(codes.tolist())) > 3
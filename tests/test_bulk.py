@@ -0,0 +1,66 @@
+import io
+import json
+from datetime import datetime, timedelta
+from modules.bulk import validate_file
+from modules.certificate import Certificate, CertificateChain
+from modules.ingest import CSV_FIELDS, write_csv_rows
+from modules.pinning import PinViolationLog
+
+NOW = datetime.now()
+
+def chain(name):
+    root = Certificate("Root", "Root", NOW - timedelta(days=1), NOW + timedelta(days=30), True, "r")
+    leaf = Certificate(name, "Root", NOW - timedelta(days=1), NOW + timedelta(days=30), False, name)
+    result = CertificateChain()
+    result.add_certificate(leaf)
+    result.add_certificate(root)
+    return result
+
+def test_csv_results_stay_aligned_after_malformed_chain(tmp_path):
+    buffer = io.StringIO()
+    buffer.write(",".join(CSV_FIELDS) + "\n")
+    for name in ("a", "b", "c"):
+        write_csv_rows(buffer, name, chain(name))
+    lines = buffer.getvalue().splitlines(keepends=True)
+    # Break the leaf row of chain "b"
+    bad = next(i for i, line in enumerate(lines) if line.startswith("b,"))
+    lines[bad] = lines[bad].replace(lines[bad].split(",")[3], "not a date")
+    path = tmp_path / "chains.csv"
+    path.write_text("".join(lines), encoding="utf-8")
+
+    output = io.StringIO()
+    summary = validate_file(path, output, workers=1)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [(r["index"], r["chain_id"], r["valid"]) for r in results] == [
+        (0, "a", True), (1, "b", False), (2, "c", True)]
+    assert results[1]["message"] == "Malformed chain"
+    assert summary["chains"] == 3
+
+def test_pins_apply_to_bulk_validation(tmp_path):
+    pins = tmp_path / "pins.json"
+    pins.write_text(json.dumps({"a": ["r"], "b": ["other"]}), encoding="utf-8")
+    path = tmp_path / "chains.jsonl"
+    path.write_text("".join(json.dumps({"certificates": [cert.to_dict() for cert in chain(name).certificates]}) + "\n"
+                            for name in ("a", "b")), encoding="utf-8")
+    for workers in (1, 2):
+        output = io.StringIO()
+        validate_file(path, output, workers=workers, pins_path=str(pins))
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [r["valid"] for r in results] == [True, False]
+        assert results[1]["message"].startswith("Pin violation")
+
+def test_pin_violations_are_logged_from_every_worker(tmp_path):
+    pins = tmp_path / "pins.json"
+    pins.write_text(json.dumps({"*.example.com": ["other"]}), encoding="utf-8")
+    path = tmp_path / "chains.jsonl"
+    names = [f"host{i}.example.com" for i in range(40)]
+    path.write_text("".join(json.dumps({"certificates": [cert.to_dict() for cert in chain(name).certificates]}) + "\n"
+                            for name in names), encoding="utf-8")
+    for workers in (1, 3):
+        log_path = tmp_path / f"violations{workers}.jsonl"
+        stats = validate_file(path, io.StringIO(), workers=workers, chunk_size=7, pins_path=str(pins),
+                              pin_log_path=str(log_path))
+        assert stats["pin_violations"] == len(names)
+        log = PinViolationLog.load(log_path)
+        assert sorted(violation.hostname for violation in log.entries) == sorted(names)
+        assert len(log.for_serial("r")) == len(names)
@@ -0,0 +1,47 @@
+import random
+from datetime import datetime, timedelta
+from modules import expiry
+from modules.certificate import Certificate, CertificateChain
+from modules.expiry import ExpiryIndex
+
+BASE = datetime(2030, 1, 1)
+
+def random_chain(rng, number):
+    chain = CertificateChain()
+    for depth in range(rng.randint(1, 3)):
+        start = BASE + timedelta(days=rng.randint(-50, 50))
+        # A small serial pool so chains share certificates
+        serial = f"s{rng.randint(0, 400)}" if depth else f"leaf{number}"
+        chain.add_certificate(Certificate(serial, "issuer", start, start + timedelta(days=rng.randint(0, 60)),
+                                          False, serial))
+    return chain
+
+def expected_range(certs, start, end):
+    return sorted((cert.valid_to, cert.serial_number) for cert in certs
+                  if (start is None or cert.valid_to >= start) and (end is None or cert.valid_to <= end))
+
+def test_index_matches_a_linear_scan(monkeypatch):
+    # Small blocks so splits and emptied blocks happen
+    monkeypatch.setattr(expiry, "BLOCK_SIZE", 4)
+    rng = random.Random(11)
+    index = ExpiryIndex()
+    chain_ids = index.add_chains(random_chain(rng, i) for i in range(300))
+    for step in range(600):
+        if rng.random() < 0.5 and chain_ids:
+            index.remove_chain(chain_ids.pop(rng.randrange(len(chain_ids))))
+        else:
+            chain_ids.append(index.add_chain(random_chain(rng, 1000 + step)))
+
+        if step % 50 == 0:
+            certs = list(index.certificates.values())
+            assert len(index.by_valid_to) == len(index.by_valid_from) == len(certs)
+            for _ in range(5):
+                start = BASE + timedelta(days=rng.randint(-60, 110))
+                end = start + timedelta(days=rng.randint(0, 40))
+                for low, high in ((start, end), (None, end), (start, None)):
+                    found = [(cert.valid_to, cert.serial_number) for cert in index.expiring_between(low, high)]
+                    assert found == expected_range(certs, low, high)
+                assert {cert.serial_number for cert in index.expired(start)} == {
+                    cert.serial_number for cert in certs if cert.valid_to < start}
+                assert {cert.serial_number for cert in index.not_yet_valid(start)} == {
+                    cert.serial_number for cert in certs if cert.valid_from > start}
@@ -0,0 +1,10 @@
+from datetime import datetime
+from modules.generator import HierarchyGenerator, write_jsonl
+
+def test_seed_and_base_time_give_identical_output(tmp_path):
+    paths = [tmp_path / "first.jsonl", tmp_path / "second.jsonl"]
+    for path in paths:
+        generator = HierarchyGenerator(seed=4, fan_out=3, depth=2, leaves=300, expired_fraction=0.1,
+                                       broken_fraction=0.1, base_time=datetime(2025, 1, 1))
+        write_jsonl(path, generator.chains())
+    assert paths[0].read_bytes() == paths[1].read_bytes()
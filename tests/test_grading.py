@@ -0,0 +1,39 @@
+import json
+import pytest
+from modules.grading import CODES, CohortGrader, encode_answers
+from modules.questions import load_questions
+
+def test_non_numeric_question_keys_are_skipped():
+    assert encode_answers({"1": "b", "x": "c", "3": "d"}, 3) == [CODES["b"], 0, CODES["d"]]
+
+def test_sheet_with_bad_key_is_still_graded():
+    grader = CohortGrader()
+    key = {str(i): question.correct_answer for i, question in enumerate(grader.questions, 1)}
+    key["extra"] = "a"
+    results = list(grader.grade([json.dumps({"learner": "alice", "answers": key})]))
+    assert grader.skipped == 0
+    assert results[0]["score"] == grader.count
+
+def write_bank(tmp_path, options, correct_answer):
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps([{"text": "Q", "options": options, "correct_answer": correct_answer}]),
+                    encoding="utf-8")
+    return path
+
+def test_question_bank_rejects_non_letter_options(tmp_path):
+    with pytest.raises(ValueError, match="not a single letter"):
+        load_questions(write_bank(tmp_path, {"1": "x", "2": "y"}, "2"))
+
+def test_question_bank_rejects_unknown_correct_answer(tmp_path):
+    with pytest.raises(ValueError, match="not one of the options"):
+        load_questions(write_bank(tmp_path, {"a": "x", "b": "y"}, "c"))
+
+def test_uppercase_options_are_normalized(tmp_path):
+    questions = load_questions(write_bank(tmp_path, {"A": "x", "B": "y"}, "B"))
+    assert questions[0].options == {"a": "x", "b": "y"}
+    grader = CohortGrader(questions)
+    list(grader.grade([json.dumps({"answers": ["b"]}), json.dumps({"answers": ["a"]}),
+                       json.dumps({"answers": ["a"]})]))
+    stats = grader.question_stats()[0]
+    assert stats["correct_rate"] == 1 / 3
+    assert stats["most_common_wrong"] == "a"
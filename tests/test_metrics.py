@@ -0,0 +1,17 @@
+from conftest import option_sets
+from modules import metrics
+
+def test_timed_validation_matches_validate(mixed_corpus):
+    chains, at, revocation, pins = mixed_corpus
+    for trust in (False, True):
+        for options in option_sets(revocation, pins):
+            expected = [chain.validate(trust, at=at, **options) for chain in chains]
+            collected = metrics.enable()
+            try:
+                timed = [chain.validate(trust, at=at, **options) for chain in chains]
+            finally:
+                metrics.disable()
+            assert timed == expected
+            assert sum(collected.outcomes.values()) == len(chains)
+            assert collected.outcomes["valid" if not trust else "trust_bypass"] == sum(
+                valid for valid, _ in expected)
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+from modules.certificate import Certificate
+from modules.paths import PathBuilder
+from modules.truststore import TrustStore
+
+NOW = datetime.now()
+
+def cert(subject, issuer, is_root=False):
+    return Certificate(subject, issuer, NOW - timedelta(days=1), NOW + timedelta(days=30),
+                       is_root, f"{subject}<-{issuer}")
+
+def linear_store():
+    # R <- I4 <- I3 <- I2 <- I1
+    certs = [cert("R", "R", True), cert("I4", "R"), cert("I3", "I4"), cert("I2", "I3"), cert("I1", "I2")]
+    return TrustStore(certs)
+
+def test_max_length_holds_regardless_of_query_order():
+    store = linear_store()
+    leaf_a = cert("a.example.com", "I3")
+    leaf_b = cert("b.example.com", "I1")
+
+    fresh = PathBuilder(store.find_issuers, at=NOW, max_length=4)
+    assert fresh.paths(leaf_b) == []
+
+    warmed = PathBuilder(store.find_issuers, at=NOW, max_length=4)
+    assert [len(path) for path in warmed.paths(leaf_a)] == [4]
+    assert warmed.paths(leaf_b) == []
+    # The warmed-up memo still serves the short path
+    assert [len(path) for path in warmed.paths(leaf_a)] == [4]
+
+def test_paths_within_limit_use_memo():
+    store = linear_store()
+    builder = PathBuilder(store.find_issuers, at=NOW, max_length=6)
+    first = builder.paths(cert("a.example.com", "I1"))
+    second = builder.paths(cert("b.example.com", "I1"))
+    assert [len(path) for path in first] == [6]
+    assert [len(path) for path in second] == [6]
+    assert builder.hits >= 1
@@ -0,0 +1,62 @@
+import json
+import pytest
+from modules.batch import BatchValidator, PIN_VIOLATION
+from modules.pinning import PinStore, PinViolationLog
+from modules.scenarios import Scenarios
+
+def pinned_to_basic_root():
+    legitimate = Scenarios.get_basic_chain()
+    root = legitimate.certificates[-1]
+    return legitimate, root, PinStore({"bank.example.com": [root.serial_number]}, PinViolationLog())
+
+def test_mitm_chain_fails_pin_with_trust_flag():
+    _, _, pins = pinned_to_basic_root()
+    chain = Scenarios.get_mitm_attack_chain()
+    result, message = chain.validate(True, pins=pins)
+    assert not result
+    assert message.startswith("Pin violation")
+    assert len(pins.log.for_hostname("bank.example.com")) == 1
+
+def test_appended_pinned_root_does_not_satisfy_pin():
+    # [bank.example.com, Malicious Root CA, Root CA]: the pinned root is
+    # present but not on the issuer path from the leaf
+    _, root, pins = pinned_to_basic_root()
+    chain = Scenarios.get_mitm_attack_chain()
+    chain.add_certificate(root)
+
+    result, message = chain.validate(True, pins=pins)
+    assert not result
+    assert message.startswith("Pin violation")
+
+    codes, messages = BatchValidator.validate([chain], True, pins=pins)
+    assert codes[0] == PIN_VIOLATION
+    assert messages[0] == message
+
+def test_linked_pinned_ca_passes():
+    legitimate, root, pins = pinned_to_basic_root()
+    leaf = legitimate.certificates[0]
+    pins.add(leaf.subject, [root.serial_number])
+    assert legitimate.validate(pins=pins) == (True, "Valid certificate chain")
+    codes, _ = BatchValidator.validate([legitimate], pins=pins)
+    assert codes[0] == 0
+
+def test_violation_log_appends_through_one_handle(tmp_path):
+    path = tmp_path / "violations.jsonl"
+    _, root, _ = pinned_to_basic_root()
+    with PinViolationLog(path) as log:
+        pins = PinStore({"bank.example.com": [root.serial_number]}, log)
+        for _ in range(3):
+            Scenarios.get_mitm_attack_chain().validate(True, pins=pins)
+        handle = log._output
+        assert handle is not None
+    assert handle.closed
+    reloaded = PinViolationLog.load(path)
+    assert len(reloaded) == 3
+    reloaded.close()
+
+def test_pin_file_values_must_be_serial_lists(tmp_path):
+    path = tmp_path / "pins.json"
+    for pins in ({"host": "abcd"}, {"host": [1, 2]}, {"host": None}):
+        path.write_text(json.dumps(pins), encoding="utf-8")
+        with pytest.raises(ValueError, match="list of serial strings"):
+            PinStore.load(path)
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+import pytest
+from conftest import option_sets
+from modules.certificate import Certificate, CertificateChain
+from modules.policy import ValidationPolicy
+
+NOW = datetime(2030, 1, 1)
+
+def make_chain(*certs):
+    chain = CertificateChain()
+    for cert in certs:
+        chain.add_certificate(cert)
+    return chain
+
+def cert(subject, issuer, days_from=-10, days_to=10, is_root=False):
+    return Certificate(subject, issuer, NOW + timedelta(days=days_from), NOW + timedelta(days=days_to),
+                       is_root, f"{subject}-serial")
+
+def three_chain(**leaf):
+    return make_chain(cert("leaf", "Intermediate", **leaf), cert("Intermediate", "Root"),
+                      cert("Root", "Root", is_root=True))
+
+def test_default_policy_matches_validate(mixed_corpus):
+    chains, at, revocation, pins = mixed_corpus
+    for trust in (False, True):
+        for options in option_sets(revocation, pins):
+            expected = [chain.validate(trust, at=at, **options) for chain in chains]
+            fail_fast = ValidationPolicy(trust_server_certificate=trust, **options)
+            assert [fail_fast.validate(chain, at) for chain in chains] == expected
+            # All-errors mode agrees on validity and reports validate's failure among its errors
+            all_errors = ValidationPolicy(trust_server_certificate=trust, collect_all_errors=True, **options)
+            for chain, (valid, message) in zip(chains, expected):
+                result, errors = all_errors.validate(chain, at)
+                assert result == valid
+                assert (errors == []) if valid else (message in errors)
+
+def test_max_length():
+    policy = ValidationPolicy(max_length=2)
+    valid, message = policy.validate(three_chain(), NOW)
+    assert not valid
+    assert message == "Chain has 3 certificates, more than the allowed 2"
+    assert ValidationPolicy(max_length=3).validate(three_chain(), NOW) == (True, "Valid certificate chain")
+    with pytest.raises(ValueError):
+        ValidationPolicy(max_length=0)
+
+def test_allowed_roots_by_subject_or_serial():
+    assert ValidationPolicy(allowed_roots={"Root"}).validate(three_chain(), NOW)[0]
+    assert ValidationPolicy(allowed_roots=["Root-serial"]).validate(three_chain(), NOW)[0]
+    assert ValidationPolicy(allowed_roots={"Other Root"}).validate(three_chain(), NOW) == (
+        False, "Root Root is not allowed by policy")
+
+def test_clock_skew_tolerates_small_date_errors():
+    not_yet_valid = three_chain(days_from=1)
+    expired = three_chain(days_to=-1)
+    for chain in (not_yet_valid, expired):
+        assert not ValidationPolicy().validate(chain, NOW)[0]
+        assert ValidationPolicy(clock_skew=timedelta(days=2)).validate(chain, NOW)[0]
+        assert not ValidationPolicy(clock_skew=timedelta(hours=12)).validate(chain, NOW)[0]
+    with pytest.raises(ValueError):
+        ValidationPolicy(clock_skew=timedelta(seconds=-1))
+
+def test_all_errors_mode_reports_every_failure():
+    chain = make_chain(cert("leaf", "Intermediate", days_to=-1), cert("Other", "Root"),
+                       cert("Root", "Root"))
+    policy = ValidationPolicy(max_length=2, collect_all_errors=True)
+    valid, errors = policy.validate(chain, NOW)
+    assert not valid
+    assert errors == [
+        "Chain has 3 certificates, more than the allowed 2",
+        "Certificate for leaf has expired",
+        "Invalid issuer: leaf not issued by Other",
+        "Chain doesn't end with a trusted root certificate",
+    ]
+    assert ValidationPolicy(collect_all_errors=True).validate(three_chain(), NOW) == (True, [])
+    assert ValidationPolicy(collect_all_errors=True).validate(CertificateChain(), NOW) == (False, ["Empty chain"])
@@ -0,0 +1,17 @@
+from modules.generator import HierarchyGenerator, write_jsonl
+from modules.ingest import CertificateReader
+from modules.pool import CertificatePool
+
+def test_streaming_pools_only_ca_certificates(tmp_path):
+    path = tmp_path / "chains.jsonl"
+    write_jsonl(path, HierarchyGenerator(seed=0, fan_out=2, depth=2, leaves=500).chains())
+    pool = CertificatePool()
+    chains = [chain for _, chain, _ in CertificateReader(path, pool=pool).chains()]
+
+    leaves = {id(chain.certificates[0]) for chain in chains}
+    pooled = {id(cert) for cert in pool.certificates.values()}
+    assert not leaves & pooled
+    assert len(pool) == len({id(cert) for chain in chains for cert in chain.certificates[1:]})
+    report = pool.report()
+    assert report["leaves"] == len(chains)
+    assert report["index_bytes"] > 0
@@ -0,0 +1,31 @@
+import asyncio
+import json
+from modules.quizserver import QuizEngine, QuizServer
+
+def test_bad_session_values_get_error_replies():
+    server = QuizServer(QuizEngine())
+    owned = set()
+    session = server.handle({"op": "start"}, owned)["session"]
+    for bad in ([session], {"id": session}, True, str(session), None):
+        assert "error" in server.handle({"op": "answer", "session": bad, "answer": "a"}, owned)
+    assert "correct" in server.handle({"op": "answer", "session": session, "answer": "a"}, owned)
+
+def test_connection_survives_malformed_request():
+    async def exchange():
+        server = QuizServer(QuizEngine())
+        listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        requests = [{"op": "answer", "session": [1]}, {"op": "start"}, {"op": "stats"}]
+        writer.write(b"".join(json.dumps(r).encode() + b"\n" for r in requests))
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return replies
+
+    replies = asyncio.run(exchange())
+    assert "error" in replies[0]
+    assert "session" in replies[1]
+    assert "stats" in replies[2]
@@ -0,0 +1,26 @@
+import random
+import uuid
+from modules.revocation import RevocationList
+
+def serial(value):
+    return str(uuid.UUID(int=value))
+
+def test_lookups_match_set_membership(tmp_path):
+    rng = random.Random(7)
+    values = [rng.getrandbits(128) for _ in range(3000)]
+    # Shared high halves, and highs that differ only in their lowest bits
+    values += [(12345 << 64) | i for i in range(50)]
+    values += [((1 << 63) + i) << 64 | 99 for i in range(50)]
+    values += [0, (1 << 128) - 1]
+    revoked = {serial(value) for value in values[::2]} | {"not-a-uuid"}
+    probes = [serial(value) for value in values] + [serial(rng.getrandbits(128)) for _ in range(500)]
+    probes += ["not-a-uuid", "other"]
+
+    path = tmp_path / "revoked.txt"
+    path.write_text("\n".join(sorted(revoked)) + "\n", encoding="utf-8")
+    for revocations in (RevocationList(revoked), RevocationList.load(path), RevocationList.load(path, bloom=True)):
+        expected = [probe in revoked for probe in probes]
+        assert [revocations.is_revoked(probe) for probe in probes] == expected
+        # Second pass answers from the recent-lookup cache
+        assert [revocations.is_revoked(probe) for probe in probes] == expected
+        assert [bool(flag) for flag in revocations.revoked_mask(probes)] == expected